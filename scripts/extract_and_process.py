@@ -6,16 +6,22 @@
 重组为标准格式后进行纵向随访数据处理。
 
 使用方法：
-    python scripts/extract_and_process.py [原始文件路径.xlsx]
+    python scripts/extract_and_process.py [原始文件路径.xlsx] [--emit excel|csv|parquet|all]
+    python scripts/extract_and_process.py [原始文件路径.xlsx] --survival-only
 
     如果不提供参数，会弹出文件选择对话框
 """
 
+import argparse
 import sys
 import os
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
+from typing import Callable, Iterator, Optional, Sequence
 from tkinter import Tk, filedialog, messagebox
 import pandas as pd
 
@@ -24,10 +30,39 @@ project_root = Path(__file__).resolve().parent.parent
 os.chdir(project_root)
 sys.path.insert(0, str(project_root))
 
-from src.longitudinal_importer import LongitudinalDataImporter
-from src.longitudinal_processor import LongitudinalEventProcessor
+from src.data_exporter import write_sheets_to_excel
+from src.data_importer import EXCEL_READ_ENGINE
+from src.pipeline import DEFAULT_EMIT, add_emit_arguments, parse_emit, run_pipeline
 from src.logger import setup_logger
 
+# 中文数字到阿拉伯数字的映射
+CHINESE_TO_ARABIC = {
+    "一": "1",
+    "二": "2",
+    "三": "3",
+    "四": "4",
+    "五": "5",
+    "六": "6",
+    "七": "7",
+    "八": "8",
+    "九": "9",
+    "十": "10",
+}
+
+# sheet名称中的时间点: "第X个月"或"第X月" (阿拉伯数字 / 中文数字)
+ARABIC_MONTH_PATTERN = re.compile(r"第(\d+)个?月")
+CHINESE_MONTH_PATTERN = re.compile(r"第([一二三四五六七八九十])个?月")
+
+# 详细事件分布: 事件名称 -> 首次发生日期列
+EVENT_DATE_COLUMNS = {
+    "心绞痛": "first_angina_date",
+    "住院": "first_hospitalization_date",
+    "心肌梗死": "first_mi_date",
+    "心衰": "first_heart_failure_date",
+    "血运重建": "first_revascularization_date",
+    "死亡": "first_death_date",
+}
+
 
 def extract_time_point_from_sheet_name(sheet_name: str) -> str:
     """
@@ -36,110 +71,161 @@ def extract_time_point_from_sheet_name(sheet_name: str) -> str:
     例如: '第三个月随访_CAGSFB1_627CAG随访表1' -> '3个月'
           '第12个月随访_CAGSFB1_627CAG随访表1' -> '12个月'
     """
-    # 中文数字到阿拉伯数字的映射
-    chinese_to_arabic = {
-        "一": "1",
-        "二": "2",
-        "三": "3",
-        "四": "4",
-        "五": "5",
-        "六": "6",
-        "七": "7",
-        "八": "8",
-        "九": "9",
-        "十": "10",
-    }
-
     # 尝试匹配"第X个月"或"第X月" (阿拉伯数字)
-    match = re.search(r"第(\d+)个?月", sheet_name)
+    match = ARABIC_MONTH_PATTERN.search(sheet_name)
     if match:
         months = match.group(1)
         return f"{months}个月"
 
     # 尝试匹配中文数字 "第X个月" 或 "第X月"
-    for chinese, arabic in chinese_to_arabic.items():
-        match = re.search(rf"第{chinese}个?月", sheet_name)
-        if match:
-            return f"{arabic}个月"
+    match = CHINESE_MONTH_PATTERN.search(sheet_name)
+    if match:
+        return f"{CHINESE_TO_ARABIC[match.group(1)]}个月"
 
     # 如果是personal或其他格式，返回sheet名称
     return sheet_name
 
 
-def extract_followup_sheets(input_file: Path, output_file: Path) -> None:
+def read_sheet(input_file: Path, sheet_name: str) -> pd.DataFrame:
+    """
+    读取单个sheet（模块级函数，供进程池在子进程中调用）
+
+    Args:
+        input_file: Excel文件路径
+        sheet_name: sheet名称
+
+    Returns:
+        sheet数据
+    """
+    return pd.read_excel(input_file, sheet_name=sheet_name, engine=EXCEL_READ_ENGINE)
+
+
+def read_sheets_in_pool(
+    input_file: Path, sheet_names: Sequence[str], max_workers: int
+) -> Iterator[pd.DataFrame]:
+    """
+    在进程池中并行读取多个sheet，按原顺序生成各sheet的数据
+
+    同时最多只有max_workers个sheet在读取或等待写入，已读完的数据不会无限堆积。
+
+    Args:
+        input_file: Excel文件路径
+        sheet_names: sheet名称
+        max_workers: 进程数
+
+    Yields:
+        每个sheet的数据
+    """
+    names = iter(sheet_names)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque(
+            executor.submit(read_sheet, input_file, name) for name in islice(names, max_workers)
+        )
+        while pending:
+            df = pending.popleft().result()
+            for name in islice(names, 1):
+                pending.append(executor.submit(read_sheet, input_file, name))
+            yield df
+
+
+def extract_followup_sheets(input_file: Path, output_file: Path, max_workers: int = 1) -> None:
     """
     从原始文件中提取所有随访表1数据并保存
 
     Args:
         input_file: 原始Excel文件路径
         output_file: 输出Excel文件路径
+        max_workers: 并行读取sheet的进程数，默认1（单进程，逐个sheet读取并写入）；
+            0表示使用全部CPU核心。每个进程都要重新打开并解析整个文件，只有sheet多且大时才值得开启
     """
     logger = setup_logger("extract_followup")
 
     logger.info(f"\n正在读取原始文件: {input_file}")
     logger.info(f"文件大小: {input_file.stat().st_size / (1024*1024):.1f} MB")
 
-    # 读取Excel文件
+    # 读取Excel文件（calamine不可用时由pandas按扩展名选择引擎，.xlsx的openpyxl读取器以只读模式打开）
     logger.info("\n加载Excel文件 (这可能需要几分钟)...")
-    xls = pd.ExcelFile(input_file)
+    with pd.ExcelFile(input_file, engine=EXCEL_READ_ENGINE) as xls:
+        sheet_names = xls.sheet_names
 
-    logger.info(f"文件共有 {len(xls.sheet_names)} 个sheet")
+        logger.info(f"文件共有 {len(sheet_names)} 个sheet")
 
-    # 找到所有包含"随访表1"的sheet
-    followup_sheets = [name for name in xls.sheet_names if "随访表1" in name]
-    logger.info(f"\n找到 {len(followup_sheets)} 个随访表1 sheet:")
-    for i, name in enumerate(followup_sheets, 1):
-        time_point = extract_time_point_from_sheet_name(name)
-        logger.info(f"  {i}. {name} -> {time_point}")
+        # 找到所有包含"随访表1"的sheet（只读取这些sheet）
+        followup_sheets = [name for name in sheet_names if "随访表1" in name]
+        logger.info(f"\n找到 {len(followup_sheets)} 个随访表1 sheet:")
+        # 每个sheet的时间点只提取一次，列表显示和导出共用
+        time_points = [extract_time_point_from_sheet_name(name) for name in followup_sheets]
+        for i, (name, time_point) in enumerate(zip(followup_sheets, time_points), 1):
+            logger.info(f"  {i}. {name} -> {time_point}")
 
-    # 读取并重新组织数据
-    logger.info("\n开始提取数据...")
-    with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
-        for sheet_name in followup_sheets:
-            logger.info(f"  处理: {sheet_name}")
+        max_workers = min(max_workers or os.cpu_count() or 1, len(followup_sheets))
+        if max_workers > 1:
+            frames = read_sheets_in_pool(input_file, followup_sheets, max_workers)
+        else:
+            # 单进程时从已打开的文件依次解析，每个sheet写入后即可释放
+            frames = (xls.parse(name) for name in followup_sheets)
 
-            # 读取数据
-            df = pd.read_excel(xls, sheet_name=sheet_name)
+        def iter_extracted_sheets():
+            for sheet_name, time_point, df in zip(followup_sheets, time_points, frames):
+                logger.info(f"  处理: {sheet_name}")
 
-            # 提取时间点作为新的sheet名称
-            time_point = extract_time_point_from_sheet_name(sheet_name)
+                # 清理sheet名称 (Excel sheet名称不能超过31字符)
+                if len(time_point) > 31:
+                    time_point = time_point[:31]
 
-            # 清理sheet名称 (Excel sheet名称不能超过31字符)
-            if len(time_point) > 31:
-                time_point = time_point[:31]
+                logger.info(f"    -> 导出为: {time_point} ({len(df)} 行)")
+                yield time_point, df
 
-            # 保存到新文件
-            df.to_excel(writer, sheet_name=time_point, index=False)
-            logger.info(f"    -> 导出为: {time_point} ({len(df)} 行)")
+        # 读取并重新组织数据，逐个sheet以只写模式写入新文件
+        logger.info("\n开始提取数据...")
+        write_sheets_to_excel(iter_extracted_sheets(), output_file)
 
     logger.info(f"\n✓ 提取完成!")
     logger.info(f"输出文件: {output_file}")
     logger.info(f"输出文件大小: {output_file.stat().st_size / 1024:.1f} KB")
 
 
-def select_excel_file() -> str:
-    """打开文件选择对话框"""
+def create_dialog_root() -> Tk:
+    """创建用于弹出对话框的隐藏Tk根窗口"""
     root = Tk()
     root.withdraw()
     root.attributes("-topmost", True)
+    return root
+
+
+def select_excel_file(root: Optional[Tk] = None) -> str:
+    """
+    打开文件选择对话框
+
+    Args:
+        root: 复用的Tk根窗口，None时临时创建并在选择后销毁
+    """
+    own_root = root is None
+    if own_root:
+        root = create_dialog_root()
 
     file_path = filedialog.askopenfilename(
+        parent=root,
         title="选择原始数据文件（包含多个随访表Sheet）",
         initialdir=str(project_root / "data" / "raw"),
         filetypes=[("Excel files", "*.xlsx *.xls"), ("All files", "*.*")],
     )
 
-    root.destroy()
+    if own_root:
+        root.destroy()
     return file_path if file_path else None
 
 
-def process_extracted_file(excel_file_path: str, patient_group: str = "CAG") -> bool:
+def process_extracted_file(
+    excel_file_path: str, patient_group: str = "CAG", emit=DEFAULT_EMIT
+) -> bool:
     """
     处理提取后的文件
 
     Args:
         excel_file_path: 提取后的Excel文件路径
         patient_group: 患者组类型 (CAG/PCI)
+        emit: 要导出的格式 (excel/csv/parquet)
 
     Returns:
         bool: 处理是否成功
@@ -153,70 +239,33 @@ def process_extracted_file(excel_file_path: str, patient_group: str = "CAG") ->
     logger.info("=" * 60)
 
     try:
-        # 1. 导入数据
-        logger.info("\n步骤 1/3: 导入数据")
-        importer = LongitudinalDataImporter()
-        if not importer.load_excel_file(excel_file_path):
+        # 导入、处理事件并导出结果
+        result = run_pipeline(
+            excel_file_path,
+            project_root / "output",
+            endpoint="death",
+            excel_name=f"{patient_group}_followup_results",
+            survival_name=f"survival_{patient_group}",
+            sheet_name="Sheet1",
+            emit=emit,
+        )
+        if result is None:
             logger.error("❌ 加载文件失败")
             return False
-        logger.info(f"✅ 成功导入 {len(importer.sheet_data)} 个时间点的数据")
-
-        # 2. 导入纵向数据
-        logger.info("\n步骤 2/3: 导入纵向患者记录")
-        longitudinal_records = importer.import_longitudinal_data()
-        logger.info(f"✅ 成功导入 {len(longitudinal_records)} 条患者记录")
 
-        # 3. 处理事件
-        logger.info("\n步骤 3/3: 处理事件数据")
-        processor = LongitudinalEventProcessor(endpoint="death")
-        followup_records = processor.process_batch(longitudinal_records)
+        followup_records = result.followup_records
+        df_output = result.df
         logger.info(f"✅ 成功处理 {len(followup_records)} 条随访记录")
 
-        # 4. 导出结果
-        logger.info("\n步骤 4/4: 导出结果")
-        output_data = [record.to_flattened_dict() for record in followup_records]
-        df_output = pd.DataFrame(output_data)
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_dir = project_root / "output"
-        output_dir.mkdir(exist_ok=True)
-
-        # 导出完整Excel
-        output_filename = f"{patient_group}_followup_results_{timestamp}.xlsx"
-        output_path = output_dir / output_filename
-        df_output.to_excel(output_path, index=False, engine="openpyxl")
-        logger.info(f"✅ Excel已导出: {output_filename}")
-
-        # 导出生存分析CSV
-        survival_filename = f"survival_{patient_group}_{timestamp}.csv"
-        try:
-            survival_cols = [
-                "patient_id",
-                "patient_name",
-                "birthday",
-                "age",
-                "gender",
-                "group_name",
-                "enrollment_date",
-                "survival_time_days",
-                "event_occurred",
-                "endpoint_event",
-            ]
-            existing_cols = [c for c in survival_cols if c in df_output.columns]
-            survival_df = df_output[existing_cols].copy()
-
-            survival_path = output_dir / survival_filename
-            survival_df.to_csv(survival_path, index=False)
-            logger.info(f"✅ 生存分析CSV已导出: {survival_filename}")
-        except Exception as e:
-            logger.warning(f"⚠️ 生存分析CSV导出失败: {e}")
+        for fmt, path in result.output_files.items():
+            logger.info(f"✅ {fmt}已导出: {path.name}")
 
         logger.info("\n" + "=" * 60)
         logger.info("✅ 处理完成！")
         logger.info("=" * 60)
         logger.info(f"输出文件:")
-        logger.info(f"  - {output_filename}")
-        logger.info(f"  - {survival_filename}")
+        for path in result.output_files.values():
+            logger.info(f"  - {path.name}")
         logger.info(f"患者数量: {len(followup_records)}")
 
         # 统计信息
@@ -230,15 +279,9 @@ def process_extracted_file(excel_file_path: str, patient_group: str = "CAG") ->
         
         # 详细事件分布
         logger.info(f"\n详细事件分布:")
-        event_details = {
-            "心绞痛": df_output["first_angina_date"].notna().sum() if "first_angina_date" in df_output.columns else 0,
-            "住院": df_output["first_hospitalization_date"].notna().sum() if "first_hospitalization_date" in df_output.columns else 0,
-            "心肌梗死": df_output["first_mi_date"].notna().sum() if "first_mi_date" in df_output.columns else 0,
-            "心衰": df_output["first_heart_failure_date"].notna().sum() if "first_heart_failure_date" in df_output.columns else 0,
-            "血运重建": df_output["first_revascularization_date"].notna().sum() if "first_revascularization_date" in df_output.columns else 0,
-            "死亡": df_output["first_death_date"].notna().sum() if "first_death_date" in df_output.columns else 0,
-        }
-        for event_name, count in event_details.items():
+        date_counts = df_output.reindex(columns=list(EVENT_DATE_COLUMNS.values())).notna().sum()
+        for event_name, column in EVENT_DATE_COLUMNS.items():
+            count = date_counts[column]
             if count > 0:
                 logger.info(f"  - {event_name}: {count} 例")
 
@@ -254,45 +297,73 @@ def process_extracted_file(excel_file_path: str, patient_group: str = "CAG") ->
 
 def main():
     """主函数"""
+    dialog_root: Optional[Tk] = None
+
+    def get_dialog_root() -> Tk:
+        # 所有对话框共用一个隐藏的Tk根窗口，首次需要时才创建
+        nonlocal dialog_root
+        if dialog_root is None:
+            dialog_root = create_dialog_root()
+        return dialog_root
+
+    try:
+        run_extract_and_process(get_dialog_root)
+    finally:
+        if dialog_root is not None:
+            dialog_root.destroy()
+
+
+def run_extract_and_process(get_dialog_root: Callable[[], Tk]) -> None:
+    """
+    提取并处理随访数据的完整交互流程
+
+    Args:
+        get_dialog_root: 返回对话框所用Tk根窗口的函数
+    """
     logger = setup_logger("extract_and_process")
 
     logger.info("\n" + "=" * 60)
     logger.info("随访表自动提取和处理工具")
     logger.info("=" * 60)
 
+    parser = argparse.ArgumentParser(description="随访表自动提取和处理工具")
+    parser.add_argument("source_file", nargs="?", help="原始Excel文件路径 (不提供时弹出选择对话框)")
+    add_emit_arguments(parser)
+    args = parser.parse_args()
+
     # 获取源文件路径
-    if len(sys.argv) > 1:
-        source_file = sys.argv[1]
+    if args.source_file:
+        source_file = args.source_file
+        if not Path(source_file).exists():
+            logger.error(f"文件不存在: {source_file}")
+            return
     else:
+        # 文件选择对话框只会返回已存在的文件
         logger.info("\n请选择包含随访表Sheet的原始Excel文件...")
-        source_file = select_excel_file()
+        source_file = select_excel_file(get_dialog_root())
 
     if not source_file:
         logger.warning("未选择文件，程序退出")
         return
 
-    if not Path(source_file).exists():
-        logger.error(f"文件不存在: {source_file}")
-        return
+    source_path = Path(source_file)
 
     # 检测患者组类型
     patient_group = "CAG"  # 默认
-    filename = Path(source_file).name.upper()
+    filename = source_path.name.upper()
     if "PCI" in filename:
         patient_group = "PCI"
     elif "CAG" in filename:
         patient_group = "CAG"
     else:
         # 询问用户
-        root = Tk()
-        root.withdraw()
         response = messagebox.askquestion(
             "患者组类型",
             "这是 PCI 组患者吗？\n\n是 = PCI组\n否 = CAG组",
             icon="question",
+            parent=get_dialog_root(),
         )
         patient_group = "PCI" if response == "yes" else "CAG"
-        root.destroy()
 
     logger.info(f"\n识别为: {patient_group} 组")
 
@@ -302,12 +373,11 @@ def main():
     logger.info("=" * 60)
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    source_path = Path(source_file)
     output_filename = f"extracted_{source_path.stem}_{timestamp}.xlsx"
     extracted_file = project_root / "data" / "raw" / output_filename
 
     try:
-        extract_followup_sheets(Path(source_file), extracted_file)
+        extract_followup_sheets(source_path, extracted_file)
     except Exception as e:
         logger.error(f"\n提取失败: {e}")
         input("\n按回车键退出...")
@@ -318,21 +388,23 @@ def main():
     logger.info("步骤 2/2: 处理数据并生成输出")
     logger.info("=" * 60)
 
-    success = process_extracted_file(str(extracted_file), patient_group=patient_group)
+    success = process_extracted_file(
+        str(extracted_file),
+        patient_group=patient_group,
+        emit=parse_emit(args.emit, args.survival_only),
+    )
 
     if success:
         logger.info("\n🎉 全部完成！")
 
         # 询问是否保留中间文件
-        root = Tk()
-        root.withdraw()
         keep_file = messagebox.askquestion(
             "保留中间文件？",
             f"是否保留提取的临时文件？\n\n{extracted_file}\n\n"
             f"（文件已保存在 data/raw/ 目录，可用于后续处理）",
             icon="question",
+            parent=get_dialog_root(),
         )
-        root.destroy()
 
         if keep_file == "no":
             try:
@@ -12,12 +12,35 @@
 如果不提供参数，将使用默认路径。
 """
 
+import os
 import sys
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
 
-import pandas as pd
+import openpyxl
+
+# 中文数字到阿拉伯数字的映射
+CHINESE_TO_ARABIC = {
+    "一": "1",
+    "二": "2",
+    "三": "3",
+    "四": "4",
+    "五": "5",
+    "六": "6",
+    "七": "7",
+    "八": "8",
+    "九": "9",
+    "十": "10",
+}
+
+# sheet名称中的时间点 (模块加载时预编译)
+ARABIC_MONTH_PATTERN = re.compile(r"第(\d+)个?月")
+CHINESE_MONTH_PATTERN = re.compile(r"第([一二三四五六七八九十])个?月")
 
 
 def extract_time_point_from_sheet_name(sheet_name: str) -> str:
@@ -27,80 +50,152 @@ def extract_time_point_from_sheet_name(sheet_name: str) -> str:
     例如: '第三个月随访_CAGSFB1_627CAG随访表1' -> '3个月'
           '第12个月随访_CAGSFB1_627CAG随访表1' -> '12个月'
     """
-    # 中文数字到阿拉伯数字的映射
-    chinese_to_arabic = {
-        "一": "1",
-        "二": "2",
-        "三": "3",
-        "四": "4",
-        "五": "5",
-        "六": "6",
-        "七": "7",
-        "八": "8",
-        "九": "9",
-        "十": "10",
-    }
-
     # 尝试匹配"第X个月"或"第X月" (阿拉伯数字)
-    match = re.search(r"第(\d+)个?月", sheet_name)
+    match = ARABIC_MONTH_PATTERN.search(sheet_name)
     if match:
         months = match.group(1)
         return f"{months}个月"
 
     # 尝试匹配中文数字 "第X个月" 或 "第X月"
-    for chinese, arabic in chinese_to_arabic.items():
-        # 匹配 "第三个月" 或 "第三月"
-        match = re.search(rf"第{chinese}个?月", sheet_name)
-        if match:
-            return f"{arabic}个月"
+    # 匹配 "第三个月" 或 "第三月"
+    match = CHINESE_MONTH_PATTERN.search(sheet_name)
+    if match:
+        return f"{CHINESE_TO_ARABIC[match.group(1)]}个月"
 
     # 如果是personal或其他格式，返回sheet名称
     return sheet_name
 
 
-def extract_followup_sheets(input_file: Path, output_file: Path) -> None:
+def iter_sheet_rows(source_sheet) -> Iterator[Tuple[Any, ...]]:
+    """
+    逐行生成只读sheet的行（与pandas读取时一样去掉末尾的空行）
+
+    Args:
+        source_sheet: 只读模式打开的sheet
+
+    Yields:
+        行数据 (第一行为表头)
+    """
+    # 部分工具生成的文件记录的sheet尺寸不准确，重新计算以免漏读数据
+    source_sheet.reset_dimensions()
+
+    # 空行先暂存，之后出现非空行时再输出：中间的空行保留，末尾的空行丢弃
+    blank_rows = []
+    for row in source_sheet.iter_rows(values_only=True):
+        if all(value is None for value in row):
+            blank_rows.append(row)
+            continue
+        yield from blank_rows
+        blank_rows.clear()
+        yield row
+
+
+def read_sheet_rows(input_file: Path, sheet_name: str) -> List[Tuple[Any, ...]]:
+    """
+    以只读模式读取一个sheet的所有行
+
+    在子进程中执行，每个sheet各自打开文件，以便并行解析多个sheet。
+
+    Args:
+        input_file: 原始Excel文件路径
+        sheet_name: sheet名称
+
+    Returns:
+        行数据列表 (第一行为表头)
+    """
+    workbook = openpyxl.load_workbook(input_file, read_only=True, data_only=True)
+    try:
+        return list(iter_sheet_rows(workbook[sheet_name]))
+    finally:
+        workbook.close()
+
+
+def read_sheets_in_pool(
+    input_file: Path, sheet_names: Sequence[str], max_workers: int
+) -> Iterator[List[Tuple[Any, ...]]]:
+    """
+    在进程池中并行读取多个sheet，按原顺序生成各sheet的行
+
+    同时最多只有max_workers个sheet在读取或等待写入，已读完的行数据不会无限堆积。
+
+    Args:
+        input_file: 原始Excel文件路径
+        sheet_names: sheet名称
+        max_workers: 进程数
+
+    Yields:
+        每个sheet的行数据列表
+    """
+    names = iter(sheet_names)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque(
+            executor.submit(read_sheet_rows, input_file, name)
+            for name in islice(names, max_workers)
+        )
+        while pending:
+            rows = pending.popleft().result()
+            for name in islice(names, 1):
+                pending.append(executor.submit(read_sheet_rows, input_file, name))
+            yield rows
+
+
+def extract_followup_sheets(input_file: Path, output_file: Path, max_workers: int = 1) -> None:
     """
     从原始文件中提取所有随访表1数据并保存
 
     Args:
         input_file: 原始Excel文件路径
         output_file: 输出Excel文件路径
+        max_workers: 并行读取sheet的进程数，默认1（单进程，逐行流式复制，内存占用最小）；
+            0表示使用全部CPU核心。每个进程都要重新打开并解析整个文件，只有sheet多且大时才值得开启
     """
     print(f"\n正在读取原始文件: {input_file}")
     print(f"文件大小: {input_file.stat().st_size / (1024*1024):.1f} MB")
 
-    # 读取Excel文件
+    # 以只读模式打开Excel文件
     print("\n加载Excel文件 (这可能需要几分钟)...")
-    xls = pd.ExcelFile(input_file)
-
-    print(f"文件共有 {len(xls.sheet_names)} 个sheet")
-
-    # 找到所有包含"随访表1"的sheet
-    followup_sheets = [name for name in xls.sheet_names if "随访表1" in name]
-    print(f"\n找到 {len(followup_sheets)} 个随访表1 sheet:")
-    for i, name in enumerate(followup_sheets, 1):
-        time_point = extract_time_point_from_sheet_name(name)
-        print(f"  {i}. {name} -> {time_point}")
-
-    # 读取并重新组织数据
-    print("\n开始提取数据...")
-    with pd.ExcelWriter(output_file, engine="openpyxl") as writer:
-        for sheet_name in followup_sheets:
+    workbook = openpyxl.load_workbook(input_file, read_only=True, data_only=True)
+    try:
+        sheet_names = workbook.sheetnames
+        print(f"文件共有 {len(sheet_names)} 个sheet")
+
+        # 找到所有包含"随访表1"的sheet
+        followup_sheets = [name for name in sheet_names if "随访表1" in name]
+        print(f"\n找到 {len(followup_sheets)} 个随访表1 sheet:")
+        # 每个sheet的时间点只提取一次，列表显示和导出共用
+        time_points = [extract_time_point_from_sheet_name(name) for name in followup_sheets]
+        for i, (name, time_point) in enumerate(zip(followup_sheets, time_points), 1):
+            print(f"  {i}. {name} -> {time_point}")
+
+        max_workers = min(max_workers or os.cpu_count() or 1, len(followup_sheets))
+        sheet_rows: Iterable[Iterable[Tuple[Any, ...]]]
+        if max_workers > 1:
+            sheet_rows = read_sheets_in_pool(input_file, followup_sheets, max_workers)
+        else:
+            # 单进程时从已打开的文件逐行读取，直接写入新文件
+            sheet_rows = (iter_sheet_rows(workbook[name]) for name in followup_sheets)
+
+        # 按原顺序逐行写入只写模式的新文件
+        print("\n开始提取数据...")
+        output_workbook = openpyxl.Workbook(write_only=True)
+        for sheet_name, time_point, rows in zip(followup_sheets, time_points, sheet_rows):
             print(f"  处理: {sheet_name}")
 
-            # 读取数据
-            df = pd.read_excel(xls, sheet_name=sheet_name)
-
-            # 提取时间点作为新的sheet名称
-            time_point = extract_time_point_from_sheet_name(sheet_name)
-
             # 清理sheet名称 (Excel sheet名称不能超过31字符)
             if len(time_point) > 31:
                 time_point = time_point[:31]
 
-            # 保存到新文件
-            df.to_excel(writer, sheet_name=time_point, index=False)
-            print(f"    -> 导出为: {time_point} ({len(df)} 行)")
+            # 复制数据到新文件
+            output_sheet = output_workbook.create_sheet(title=time_point)
+            row_count = 0
+            for row in rows:
+                output_sheet.append(row)
+                row_count += 1
+            print(f"    -> 导出为: {time_point} ({max(row_count - 1, 0)} 行)")
+    finally:
+        workbook.close()
+
+    output_workbook.save(output_file)
 
     print(f"\n✓ 提取完成!")
     print(f"输出文件: {output_file}")
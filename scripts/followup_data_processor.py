@@ -4,11 +4,11 @@
 支持自动识别患者组类型或手动指定
 """
 
+import argparse
 import sys
 import os
 from pathlib import Path
 from datetime import datetime
-from tkinter import Tk, filedialog, messagebox
 import re
 
 # Set paths
@@ -20,8 +20,23 @@ sys.path.insert(0, str(project_root))
 from src.config import Config
 from src.longitudinal_importer import LongitudinalDataImporter
 from src.longitudinal_processor import LongitudinalEventProcessor
+from src.data_exporter import fast_to_csv, fast_to_excel
+from src.longitudinal_models import LongitudinalFollowupRecord
 import pandas as pd
 
+# 导出时转换为category类型的低基数文本列
+CATEGORY_COLUMNS = ("gender", "group_name")
+
+# Event breakdown: display name -> first-occurrence date column
+EVENT_DATE_COLUMNS = {
+    "Angina": "first_angina_date",
+    "Hospitalization": "first_hospitalization_date",
+    "MI": "first_mi_date",
+    "Heart Failure": "first_heart_failure_date",
+    "Revascularization": "first_revascularization_date",
+    "Death": "first_death_date",
+}
+
 
 def select_excel_file(default_path: str = None) -> str:
     """
@@ -33,6 +48,9 @@ def select_excel_file(default_path: str = None) -> str:
     Returns:
         选择的文件路径，如果取消则返回None
     """
+    # 仅在需要对话框时才加载tkinter
+    from tkinter import Tk, filedialog
+
     root = Tk()
     root.withdraw()  # 隐藏主窗口
     root.attributes("-topmost", True)  # 窗口置顶
@@ -72,7 +90,13 @@ def detect_patient_group(file_path: str) -> str:
         return "patients"
 
 
-def process_patients(excel_file_path: str, endpoint: str = "death", group_label: str = None):
+def process_patients(
+    excel_file_path: str,
+    endpoint: str = "death",
+    group_label: str = None,
+    output_format: str = "excel",
+    survival_only: bool = False,
+):
     """
     处理患者纵向随访数据（通用版本）
 
@@ -88,6 +112,10 @@ def process_patients(excel_file_path: str, endpoint: str = "death", group_label:
             - 'hospitalization': 住院
             - 'any_event': 任何事件
         group_label: 患者组标签（用于输出文件命名），如果为None则自动检测
+        output_format: 完整结果的导出格式
+            - 'excel': Excel文件（默认）
+            - 'parquet': Parquet文件（需要安装pyarrow，写入和再读取均远快于Excel）
+        survival_only: 只导出生存分析CSV，跳过完整结果的导出（最耗时的Excel写入）
 
     Returns:
         bool: 处理是否成功
@@ -106,7 +134,10 @@ def process_patients(excel_file_path: str, endpoint: str = "death", group_label:
     print(f"  File: {excel_file_path}")
 
     importer = LongitudinalDataImporter()
-    if not importer.load_excel_file(excel_file_path):
+    # Only parse the columns the importer/processor actually read
+    if not importer.load_excel_file(
+        excel_file_path, usecols=LongitudinalDataImporter.is_required_column
+    ):
         print("  ERROR: Failed to load Excel file")
         return False
 
@@ -142,23 +173,21 @@ def process_patients(excel_file_path: str, endpoint: str = "death", group_label:
         print(f"  ERROR: Processing failed: {e}")
         return False
 
+    # Build column-wise; low-cardinality text columns as categoricals
+    df = pd.DataFrame(LongitudinalFollowupRecord.to_columnar(followup_records))
+    df = df.astype({c: "category" for c in CATEGORY_COLUMNS if c in df.columns})
+
     # Event statistics - detailed breakdown
     print("\n  Event distribution:")
-    event_counts = {}
-    for record in followup_records:
-        event_type = record.first_event_type or "no_event"
-        event_counts[event_type] = event_counts.get(event_type, 0) + 1
+    event_counts = df["first_event_type"].fillna("no_event").value_counts().sort_index()
 
-    for event_type, count in sorted(event_counts.items()):
+    for event_type, count in event_counts.items():
         percentage = (count / len(followup_records)) * 100
         print(f"    {event_type}: {count} ({percentage:.1f}%)")
 
     # Step 4: Export results
     print("\nStep 4: Exporting results...")
 
-    # Convert to dictionary list
-    output_data = [record.to_flattened_dict() for record in followup_records]
-
     # Output file path
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
@@ -166,19 +195,24 @@ def process_patients(excel_file_path: str, endpoint: str = "death", group_label:
     output_dir = project_root / "output"
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Export to Excel
+    # Export full results (Excel or Parquet)
     try:
-        df = pd.DataFrame(output_data)
-
-        excel_file = f"longitudinal_{group_label}_output_{timestamp}.xlsx"
-        excel_path = output_dir / excel_file
-        df.to_excel(str(excel_path), sheet_name="Followup Data", index=False)
-
-        print(f"  OK: Excel exported to output/{excel_file}")
-        print(f"      Total columns: {len(df.columns)}")
-        print(f"      Total records: {len(output_data)}")
+        if survival_only:
+            print("  SKIP: Full results export (survival only)")
+        elif output_format == "parquet":
+            output_file = f"longitudinal_{group_label}_output_{timestamp}.parquet"
+            df.to_parquet(str(output_dir / output_file), index=False, compression="zstd")
+            print(f"  OK: Parquet exported to output/{output_file}")
+        else:
+            output_file = f"longitudinal_{group_label}_output_{timestamp}.xlsx"
+            fast_to_excel(df, str(output_dir / output_file), sheet_name="Followup Data")
+            print(f"  OK: Excel exported to output/{output_file}")
+
+        if not survival_only:
+            print(f"      Total columns: {len(df.columns)}")
+            print(f"      Total records: {len(df)}")
     except Exception as e:
-        print(f"  ERROR: Excel export failed: {e}")
+        print(f"  ERROR: {output_format} export failed: {e}")
         return False
 
     # Export survival dataset CSV
@@ -197,11 +231,10 @@ def process_patients(excel_file_path: str, endpoint: str = "death", group_label:
         ]
 
         existing_cols = [c for c in survival_cols if c in df.columns]
-        survival_df = df[existing_cols].copy()
 
         survival_file = f"survival_{group_label}_{timestamp}.csv"
         survival_path = output_dir / survival_file
-        survival_df.to_csv(str(survival_path), index=False)
+        fast_to_csv(df.loc[:, existing_cols], str(survival_path))
 
         print(f"  OK: Survival CSV exported to output/{survival_file}")
     except Exception as e:
@@ -209,16 +242,10 @@ def process_patients(excel_file_path: str, endpoint: str = "death", group_label:
 
     # Display event type breakdown
     print("\n  Detailed event breakdown:")
-    specific_events = {
-        "Angina": df["first_angina_date"].notna().sum(),
-        "Hospitalization": df["first_hospitalization_date"].notna().sum(),
-        "MI": df["first_mi_date"].notna().sum(),
-        "Heart Failure": df["first_heart_failure_date"].notna().sum(),
-        "Revascularization": df["first_revascularization_date"].notna().sum(),
-        "Death": df["first_death_date"].notna().sum(),
-    }
-
-    for event_name, count in specific_events.items():
+    date_counts = df[list(EVENT_DATE_COLUMNS.values())].notna().sum()
+
+    for event_name, column in EVENT_DATE_COLUMNS.items():
+        count = date_counts[column]
         if count > 0:
             print(f"    {event_name}: {count} patients")
 
@@ -231,6 +258,16 @@ def process_patients(excel_file_path: str, endpoint: str = "death", group_label:
 
 def main():
     """主函数 - 通用患者数据处理"""
+    parser = argparse.ArgumentParser(description="通用患者纵向随访数据处理")
+    parser.add_argument(
+        "excel_file", nargs="?", help="输入Excel文件路径 (不指定时弹出文件选择对话框)"
+    )
+    parser.add_argument(
+        "--survival-only",
+        action="store_true",
+        help="只导出生存分析CSV，跳过最耗时的完整结果导出",
+    )
+    args = parser.parse_args()
 
     # ====== 配置区域 ======
     # 1. 设置终点事件类型
@@ -240,19 +277,30 @@ def main():
 
     # 2. 患者组标签（可选，None表示自动检测）
     group_label = None  # 或指定为 'pci', 'cag', 等
+
+    # 3. 完整结果导出格式: 'excel' 或 'parquet'（需要pyarrow）
+    output_format = "excel"
     # =====================
 
     print("\n" + "=" * 70)
     print("Patient Data Processing - File Selection")
     print("=" * 70)
-    print("\n请选择要处理的Excel文件...")
 
-    # 打开文件选择对话框
-    excel_file = select_excel_file()
+    if args.excel_file:
+        # 命令行指定了文件，无需启动文件选择对话框
+        excel_file = args.excel_file
+        if not Path(excel_file).exists():
+            print(f"\n❌ 文件不存在: {excel_file}")
+            return False
+    else:
+        print("\n请选择要处理的Excel文件...")
 
-    if not excel_file:
-        print("\n❌ 未选择文件，程序退出。")
-        return False
+        # 打开文件选择对话框（只会返回已存在的文件）
+        excel_file = select_excel_file()
+
+        if not excel_file:
+            print("\n❌ 未选择文件，程序退出。")
+            return False
 
     print(f"\n✅ 已选择文件: {excel_file}")
 
@@ -263,13 +311,10 @@ def main():
     if group_label is None:
         group_label = detected_group
 
-    # 检查文件是否存在
-    if not Path(excel_file).exists():
-        print(f"\nERROR: File not found: {excel_file}")
-        return False
-
     # 处理数据
-    success = process_patients(excel_file, endpoint, group_label)
+    success = process_patients(
+        excel_file, endpoint, group_label, output_format, survival_only=args.survival_only
+    )
 
     return success
 
@@ -2,11 +2,35 @@
 配置管理模块
 """
 
+import copy
 import yaml
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML未编译libyaml扩展时使用纯Python实现
+    from yaml import SafeLoader as _YamlLoader
+
+
+@lru_cache(maxsize=8)
+def _load_yaml(config_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    解析YAML配置文件 (按文件修改时间和大小缓存，文件变化后自动重新解析)
+
+    Args:
+        config_path: 配置文件路径
+        mtime_ns: 文件修改时间 (仅用作缓存键)
+        size: 文件大小 (仅用作缓存键)
+
+    Returns:
+        配置字典 (缓存共享，调用方不要修改)
+    """
+    with open(config_path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
+
 
 class Config:
     """
@@ -22,6 +46,8 @@ class Config:
         """
         self.config_path = config_path
         self._config: Dict[str, Any] = {}
+        # 点号分隔的完整键 -> 配置值 (包含所有层级)，用于get的快速查找
+        self._flat: Dict[str, Any] = {}
         self.load()
 
     def load(self) -> None:
@@ -29,8 +55,32 @@ class Config:
         if not os.path.exists(self.config_path):
             raise FileNotFoundError(f"配置文件不存在: {self.config_path}")
 
-        with open(self.config_path, "r", encoding="utf-8") as f:
-            self._config = yaml.safe_load(f) or {}
+        stat = os.stat(self.config_path)
+        # 复制缓存的配置，避免不同Config实例之间互相影响
+        self._config = copy.deepcopy(_load_yaml(self.config_path, stat.st_mtime_ns, stat.st_size))
+        self._flat = self._flatten(self._config)
+
+    @staticmethod
+    def _flatten(config: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+        """
+        将嵌套配置展开为点号分隔键的字典 (中间层级的字典也会保留)
+
+        Args:
+            config: 嵌套配置字典
+            prefix: 键前缀
+
+        Returns:
+            展开后的字典
+        """
+        flat: Dict[str, Any] = {}
+        for k, value in config.items():
+            if not isinstance(k, str):
+                continue
+            key = prefix + k
+            flat[key] = value
+            if isinstance(value, dict):
+                flat.update(Config._flatten(value, key + "."))
+        return flat
 
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -43,17 +93,7 @@ class Config:
         Returns:
             配置值
         """
-        keys = key.split(".")
-        value = self._config
-
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k)
-                if value is None:
-                    return default
-            else:
-                return default
-
+        value = self._flat.get(key)
         return value if value is not None else default
 
     def get_nested(self, section: str) -> Dict[str, Any]:
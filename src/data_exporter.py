@@ -1,20 +1,173 @@
 """
 数据导出模块
-支持导出为CSV、Excel等格式
+支持导出为CSV、Excel、Parquet、Feather等格式
 """
 
+import contextlib
 import logging
 import os
-from typing import List, Dict, Any
-from datetime import datetime
+import zipfile
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+from datetime import datetime, timezone
 from pathlib import Path
+import openpyxl
+from openpyxl.utils import get_column_letter
+from openpyxl.writer.excel import ExcelWriter
 import pandas as pd
 from abc import ABC, abstractmethod
 from .config import Config
 from .data_models import FollowupRecord
 
+try:
+    import xlsxwriter
+except ImportError:  # 未安装xlsxwriter时使用openpyxl写入Excel
+    xlsxwriter = None
+
 logger = logging.getLogger(__name__)
 
+# openpyxl保存xlsx(ZIP)时的deflate压缩级别: 1最快，文件略大于默认级别(6)
+XLSX_COMPRESS_LEVEL = 1
+
+# 直接写CSV时的文件缓冲区大小 (减少大文件写入时的系统调用次数)
+CSV_WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def fast_to_excel(df: pd.DataFrame, output_path: str, sheet_name: str = "Sheet1") -> str:
+    """
+    逐行流式将DataFrame写入Excel（不带单元格样式，比df.to_excel快得多）
+
+    Args:
+        df: 要导出的DataFrame
+        output_path: 输出文件路径
+        sheet_name: 工作表名称
+
+    Returns:
+        实际生成的文件路径
+    """
+    return write_sheets_to_excel([(sheet_name, df)], output_path)
+
+
+def _iter_excel_rows(df: pd.DataFrame) -> Iterator[Tuple[Any, ...]]:
+    """逐行返回DataFrame的值（缺失值统一转为None，避免写入NaN/NaT）"""
+    values = df.astype(object).where(df.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+
+def _column_widths(df: pd.DataFrame, max_width: int = 50) -> List[int]:
+    """
+    按DataFrame内容计算各列的Excel列宽（表头与最长值的字符数+2，不超过max_width）
+
+    Args:
+        df: 要导出的DataFrame
+        max_width: 最大列宽
+
+    Returns:
+        与df.columns顺序一致的列宽列表
+    """
+    widths = []
+    for column in df.columns:
+        # 缺失值在Excel中为空单元格，不计入列宽
+        longest = df[column].astype(str).str.len().max()
+        max_length = max(0 if pd.isna(longest) else int(longest), len(str(column)))
+        widths.append(min(max_length + 2, max_width))
+    return widths
+
+
+def write_sheets_to_excel(
+    sheets: Iterable[Tuple[str, pd.DataFrame]], output_path: str, autosize: bool = False
+) -> str:
+    """
+    逐行流式将多个DataFrame依次写入同一Excel文件的不同工作表
+
+    安装了xlsxwriter时使用其constant_memory模式（更快），否则使用openpyxl只写模式。
+    sheets可以是生成器，每个DataFrame写入后即可释放，内存占用只与单个工作表相关。
+
+    Args:
+        sheets: (工作表名称, DataFrame) 序列
+        output_path: 输出文件路径
+        autosize: 是否按内容设置列宽
+
+    Returns:
+        实际生成的文件路径
+    """
+    if xlsxwriter is not None:
+        workbook = xlsxwriter.Workbook(
+            str(output_path),
+            {"constant_memory": True, "default_date_format": "yyyy-mm-dd hh:mm:ss"},
+        )
+        try:
+            for sheet_name, df in sheets:
+                worksheet = workbook.add_worksheet(sheet_name)
+                if autosize:
+                    for index, width in enumerate(_column_widths(df)):
+                        worksheet.set_column(index, index, width)
+                worksheet.write_row(0, 0, [str(column) for column in df.columns])
+                for row_index, row in enumerate(_iter_excel_rows(df), start=1):
+                    worksheet.write_row(row_index, 0, row)
+        except BaseException:
+            _discard_partial_file(workbook.close, output_path)
+            raise
+        workbook.close()
+        return str(output_path)
+
+    workbook = openpyxl.Workbook(write_only=True)
+    for sheet_name, df in sheets:
+        worksheet = workbook.create_sheet(sheet_name)
+        if autosize:
+            # 只写模式下列宽须在写入行之前设置
+            for index, width in enumerate(_column_widths(df)):
+                worksheet.column_dimensions[get_column_letter(index + 1)].width = width
+        worksheet.append([str(column) for column in df.columns])
+        for row in _iter_excel_rows(df):
+            worksheet.append(row)
+    if not workbook.worksheets:
+        workbook.create_sheet()
+    # 等同于workbook.save()，但可指定压缩级别
+    archive = zipfile.ZipFile(
+        output_path, "w", zipfile.ZIP_DEFLATED, compresslevel=XLSX_COMPRESS_LEVEL, allowZip64=True
+    )
+    try:
+        workbook.properties.modified = datetime.now(timezone.utc).replace(tzinfo=None)
+        ExcelWriter(workbook, archive).save()
+    except BaseException:
+        _discard_partial_file(archive.close, output_path)
+        raise
+
+    return str(output_path)
+
+
+def _discard_partial_file(close: Callable[[], Any], output_path: str) -> None:
+    """
+    写入失败时关闭并删除不完整的文件（关闭时的异常被忽略，以免掩盖原始异常）
+
+    Args:
+        close: 关闭文件的函数
+        output_path: 输出文件路径
+    """
+    with contextlib.suppress(Exception):
+        close()
+    Path(output_path).unlink(missing_ok=True)
+
+
+def fast_to_csv(df: pd.DataFrame, output_path: str) -> str:
+    """
+    将DataFrame写出为CSV（经较大的文件缓冲区写入，输出与df.to_csv(path, index=False)相同）
+
+    数值列的格式由DataFrame的列类型决定，例如含缺失值的整数列为float类型，值写为"50.0"。
+
+    Args:
+        df: 要导出的DataFrame
+        output_path: 输出文件路径
+
+    Returns:
+        实际生成的文件路径
+    """
+    with open(output_path, "w", newline="", encoding="utf-8", buffering=CSV_WRITE_BUFFER_SIZE) as f:
+        df.to_csv(f, index=False)
+
+    return str(output_path)
+
 
 class DataExporter(ABC):
     """数据导出器抽象基类"""
@@ -49,11 +202,8 @@ class CSVExporter(DataExporter):
             实际生成的文件路径
         """
         try:
-            # 转换记录为字典列表
-            data = [record.to_flattened_dict() for record in records]
-
-            # 创建DataFrame
-            df = pd.DataFrame(data)
+            # 按列一次性创建DataFrame
+            df = pd.DataFrame(FollowupRecord.to_columnar(records))
 
             # 创建输出目录
             Path(output_path).parent.mkdir(parents=True, exist_ok=True)
@@ -84,25 +234,14 @@ class ExcelExporter(DataExporter):
             实际生成的文件路径
         """
         try:
-            # 转换记录为字典列表
-            data = [record.to_flattened_dict() for record in records]
-
-            # 创建DataFrame
-            df = pd.DataFrame(data)
+            # 按列一次性创建DataFrame
+            df = pd.DataFrame(FollowupRecord.to_columnar(records))
 
             # 创建输出目录
             Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
-            # 保存为Excel
-            with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-                df.to_excel(writer, sheet_name="Follow-up Data", index=False)
-
-                # 获取工作表并调整列宽
-                worksheet = writer.sheets["Follow-up Data"]
-                for column in worksheet.columns:
-                    max_length = max(len(str(cell.value)) for cell in column)
-                    adjusted_width = min(max_length + 2, 50)
-                    worksheet.column_dimensions[column[0].column_letter].width = adjusted_width
+            # 逐行流式写入Excel (优先使用更快的xlsxwriter，否则使用openpyxl只写模式)
+            write_sheets_to_excel([("Follow-up Data", df)], output_path, autosize=True)
 
             logger.info(f"成功导出 {len(records)} 条记录到Excel文件: {output_path}")
             return output_path
@@ -112,6 +251,66 @@ class ExcelExporter(DataExporter):
             raise
 
 
+class ParquetExporter(DataExporter):
+    """Parquet格式导出器（列式压缩存储，读写比Excel/CSV快得多，需要pyarrow）"""
+
+    def export(self, records: List[FollowupRecord], output_path: str) -> str:
+        """
+        导出为Parquet文件
+
+        Args:
+            records: 随访记录列表
+            output_path: 输出文件路径
+
+        Returns:
+            实际生成的文件路径
+        """
+        try:
+            df = pd.DataFrame(FollowupRecord.to_columnar(records))
+
+            # 创建输出目录
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+            df.to_parquet(output_path, index=False, compression="zstd")
+
+            logger.info(f"成功导出 {len(records)} 条记录到Parquet文件: {output_path}")
+            return output_path
+
+        except Exception as e:
+            logger.error(f"导出Parquet文件失败: {e}")
+            raise
+
+
+class FeatherExporter(DataExporter):
+    """Feather格式导出器（无需解析即可快速加载，需要pyarrow）"""
+
+    def export(self, records: List[FollowupRecord], output_path: str) -> str:
+        """
+        导出为Feather文件
+
+        Args:
+            records: 随访记录列表
+            output_path: 输出文件路径
+
+        Returns:
+            实际生成的文件路径
+        """
+        try:
+            df = pd.DataFrame(FollowupRecord.to_columnar(records))
+
+            # 创建输出目录
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+            df.to_feather(output_path)
+
+            logger.info(f"成功导出 {len(records)} 条记录到Feather文件: {output_path}")
+            return output_path
+
+        except Exception as e:
+            logger.error(f"导出Feather文件失败: {e}")
+            raise
+
+
 class FollowupExporter:
     """随访数据导出管理器"""
 
@@ -146,6 +345,12 @@ class FollowupExporter:
         elif self.output_format.lower() == "excel":
             filename = f"{self.filename_prefix}_{timestamp}.xlsx"
             exporter = ExcelExporter()
+        elif self.output_format.lower() == "parquet":
+            filename = f"{self.filename_prefix}_{timestamp}.parquet"
+            exporter = ParquetExporter()
+        elif self.output_format.lower() == "feather":
+            filename = f"{self.filename_prefix}_{timestamp}.feather"
+            exporter = FeatherExporter()
         else:
             raise ValueError(f"不支持的输出格式: {self.output_format}")
 
@@ -166,17 +371,17 @@ class FollowupExporter:
         output_path = self.export(records)
 
         # 生成统计摘要
+        # 一次遍历同时统计总事件数和首次事件类型分布
         total_patients = len(records)
-        patients_with_events = sum(1 for r in records if r.first_event_type)
-        total_events = sum(r.event_count for r in records)
-
-        # 按事件类型统计
-        event_type_counts: Dict[str, int] = {}
+        total_events = 0
+        first_event_types: Counter = Counter()
         for record in records:
+            total_events += record.event_count
             if record.first_event_type:
-                event_type_counts[record.first_event_type] = (
-                    event_type_counts.get(record.first_event_type, 0) + 1
-                )
+                first_event_types[record.first_event_type] += 1
+
+        patients_with_events = sum(first_event_types.values())
+        event_type_counts: Dict[str, int] = dict(first_event_types)
 
         summary = {
             "output_file": output_path,
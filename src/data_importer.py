@@ -5,8 +5,10 @@
 
 import logging
 import sqlite3
+from datetime import date
+from itertools import chain
 import pandas as pd
-from typing import List, Dict, Any, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from pathlib import Path
 from abc import ABC, abstractmethod
 from .config import Config
@@ -14,6 +16,22 @@ from .data_models import PatientRecord
 
 logger = logging.getLogger(__name__)
 
+# 安装了python-calamine时使用calamine (Rust实现) 读取Excel，大文件解析快得多；
+# 否则为None，由pandas按文件扩展名选择引擎 (.xlsx用openpyxl，.xls用xlrd)
+EXCEL_READ_ENGINE: Optional[str]
+try:
+    import python_calamine  # noqa: F401
+
+    EXCEL_READ_ENGINE = "calamine"
+except ImportError:
+    EXCEL_READ_ENGINE = None
+
+# CSV每块读取的行数 (分块读取，限制超大文件的内存占用)
+CSV_CHUNK_SIZE = 100000
+
+# SQLite每批读取的行数 (分批读取，避免fetchall一次性物化整个结果集)
+SQLITE_FETCH_SIZE = 10000
+
 
 class DataSource(ABC):
     """数据源抽象基类"""
@@ -23,6 +41,11 @@ class DataSource(ABC):
         """加载数据并返回患者记录列表"""
         pass
 
+    @abstractmethod
+    def load_data_iter(self) -> Iterator[PatientRecord]:
+        """加载数据并逐条生成患者记录 (下游可边读边处理，无需一次性持有所有记录)"""
+        pass
+
     @abstractmethod
     def close(self) -> None:
         """关闭数据源连接"""
@@ -45,8 +68,15 @@ class SQLiteDataSource(DataSource):
     def connect(self) -> None:
         """连接到数据库"""
         try:
+            # 使用默认的元组行 (行数据只需按列名转换一次为字典，无需sqlite3.Row)
             self.conn = sqlite3.connect(self.connection_string)
-            self.conn.row_factory = sqlite3.Row
+            # 只读导入的性能设置: 更大的页缓存、内存映射读取、临时数据放内存
+            self.conn.executescript(
+                "PRAGMA query_only = ON;"
+                "PRAGMA cache_size = -200000;"
+                "PRAGMA mmap_size = 268435456;"
+                "PRAGMA temp_store = MEMORY;"
+            )
             logger.info(f"连接到SQLite数据库: {self.connection_string}")
         except sqlite3.Error as e:
             logger.error(f"连接SQLite数据库失败: {e}")
@@ -62,6 +92,18 @@ class SQLiteDataSource(DataSource):
         Returns:
             患者记录列表
         """
+        return list(self.load_data_iter(table_name))
+
+    def load_data_iter(self, table_name: str = "patients") -> Iterator[PatientRecord]:
+        """
+        从SQLite数据库分批读取并逐条生成患者记录
+
+        Args:
+            table_name: 表名称
+
+        Yields:
+            患者记录
+        """
         if self.conn is None:
             self.connect()
 
@@ -71,11 +113,13 @@ class SQLiteDataSource(DataSource):
             cursor.execute(f"SELECT * FROM {table_name}")
 
             # 获取列名
-            columns = [description[0] for description in cursor.description]
+            columns = tuple(description[0] for description in cursor.description)
 
-            # 转换为PatientRecord
-            records: List[PatientRecord] = []
-            for row in cursor.fetchall():
+            # 转换为PatientRecord (入组日期与导入开始时的当天日期比较)
+            today = date.today()
+            record_count = 0
+            batches = iter(lambda: cursor.fetchmany(SQLITE_FETCH_SIZE), [])
+            for row in chain.from_iterable(batches):
                 row_dict = dict(zip(columns, row))
 
                 try:
@@ -95,14 +139,17 @@ class SQLiteDataSource(DataSource):
                         enrollment_date=enrollment_date,
                         raw_data=row_dict,
                     )
-                    records.append(record)
+                    if record.enrollment_date > today:
+                        raise ValueError("入组日期不能在未来")
 
                 except Exception as e:
                     logger.warning(f"处理记录时出错: {e}")
                     continue
 
-            logger.info(f"从 {table_name} 表加载了 {len(records)} 条患者记录")
-            return records
+                record_count += 1
+                yield record
+
+            logger.info(f"从 {table_name} 表加载了 {record_count} 条患者记录")
 
         except sqlite3.Error as e:
             logger.error(f"查询数据库失败: {e}")
@@ -135,20 +182,31 @@ class CSVDataSource(DataSource):
             患者记录列表
         """
         try:
-            # 读取CSV文件
-            df = pd.read_csv(self.file_path)
+            records = list(self.load_data_iter())
+        except Exception as e:
+            logger.error(f"读取CSV文件失败: {e}")
+            raise
 
-            logger.info(f"从CSV文件加载了 {len(df)} 条记录: {self.file_path}")
+        logger.info(f"成功转换 {len(records)} 条患者记录")
+        return records
 
-            # 转换为PatientRecord
-            records: List[PatientRecord] = []
-            for _, row in df.iterrows():
-                try:
-                    row_dict = row.to_dict()
+    def load_data_iter(self, chunksize: int = CSV_CHUNK_SIZE) -> Iterator[PatientRecord]:
+        """
+        分块读取CSV文件并逐条生成患者记录 (每次只将一块数据转换为Python对象，适合超大文件)
+
+        Args:
+            chunksize: 每块读取的行数
 
-                    # 处理NaN值
-                    row_dict = {k: (None if pd.isna(v) else v) for k, v in row_dict.items()}
+        Yields:
+            患者记录
+        """
+        today = date.today()
+        total_rows = 0
+        for rows in self._iter_row_chunks(chunksize):
+            total_rows += len(rows)
 
+            for row_dict in rows:
+                try:
                     patient_id = row_dict.get("patient_id", row_dict.get("id", ""))
                     enrollment_date = row_dict.get(
                         "enrollment_date",
@@ -164,18 +222,32 @@ class CSVDataSource(DataSource):
                         enrollment_date=enrollment_date,
                         raw_data=row_dict,
                     )
-                    records.append(record)
-
+                    if record.enrollment_date > today:
+                        raise ValueError("入组日期不能在未来")
                 except Exception as e:
                     logger.warning(f"处理记录时出错: {e}")
                     continue
 
-            logger.info(f"成功转换 {len(records)} 条患者记录")
-            return records
+                yield record
 
-        except Exception as e:
-            logger.error(f"读取CSV文件失败: {e}")
-            raise
+        logger.info(f"从CSV文件加载了 {total_rows} 条记录: {self.file_path}")
+
+    def _iter_row_chunks(self, chunksize: int) -> Iterator[List[Dict[str, Any]]]:
+        """
+        分块返回CSV的行字典 (缺失值为None)
+
+        使用pandas分块读取，内存占用只与块大小有关，与文件大小无关。
+
+        Args:
+            chunksize: 每块的行数
+
+        Yields:
+            行字典列表
+        """
+        for df in pd.read_csv(self.file_path, chunksize=chunksize):
+            # 整块一次性将NaN替换为None，再转换为字典列表 (避免iterrows逐行构造Series)
+            df = df.astype(object).where(df.notna(), None)
+            yield df.to_dict(orient="records")
 
     def close(self) -> None:
         """CSV数据源无需关闭"""
@@ -203,24 +275,31 @@ class ExcelDataSource(DataSource):
         Returns:
             患者记录列表
         """
+        return list(self.load_data_iter())
+
+    def load_data_iter(self) -> Iterator[PatientRecord]:
+        """
+        读取Excel文件并逐条生成患者记录
+
+        Yields:
+            患者记录
+        """
         try:
             # 读取Excel文件
-            df = pd.read_excel(self.file_path, sheet_name=self.sheet_name)
+            df = pd.read_excel(self.file_path, sheet_name=self.sheet_name, engine=EXCEL_READ_ENGINE)
 
             logger.info(
                 f"从Excel文件加载了 {len(df)} 条记录: {self.file_path} "
                 f"(工作表: {self.sheet_name})"
             )
 
-            # 转换为PatientRecord
-            records: List[PatientRecord] = []
-            for _, row in df.iterrows():
+            # 转换为PatientRecord (入组日期与导入开始时的当天日期比较)
+            today = date.today()
+            record_count = 0
+            # 整表一次性将NaN替换为None，再转换为字典列表 (避免iterrows逐行构造Series)
+            df = df.astype(object).where(df.notna(), None)
+            for row_dict in df.to_dict(orient="records"):
                 try:
-                    row_dict = row.to_dict()
-
-                    # 处理NaN值
-                    row_dict = {k: (None if pd.isna(v) else v) for k, v in row_dict.items()}
-
                     patient_id = row_dict.get("patient_id", row_dict.get("id", ""))
                     enrollment_date = row_dict.get(
                         "enrollment_date",
@@ -236,14 +315,17 @@ class ExcelDataSource(DataSource):
                         enrollment_date=enrollment_date,
                         raw_data=row_dict,
                     )
-                    records.append(record)
+                    if record.enrollment_date > today:
+                        raise ValueError("入组日期不能在未来")
 
                 except Exception as e:
                     logger.warning(f"处理记录时出错: {e}")
                     continue
 
-            logger.info(f"成功转换 {len(records)} 条患者记录")
-            return records
+                record_count += 1
+                yield record
+
+            logger.info(f"成功转换 {record_count} 条患者记录")
 
         except Exception as e:
             logger.error(f"读取Excel文件失败: {e}")
@@ -283,15 +365,18 @@ class DataImporter:
             raise ValueError(f"不支持的数据源类型: {source_type}")
 
     @staticmethod
-    def import_from_config(config: Config) -> List[PatientRecord]:
+    def import_from_config(config: Config) -> Iterator[PatientRecord]:
         """
         使用配置文件导入数据
 
+        返回的迭代器逐条读取数据源，消费完毕 (或被关闭) 后自动关闭数据源。
+        需要列表时可使用 list(DataImporter.import_from_config(config))。
+
         Args:
             config: 配置对象
 
         Returns:
-            患者记录列表
+            患者记录迭代器
         """
         source_type = config.get("data_source.type", "sqlite")
         connection_string = config.get("data_source.connection_string")
@@ -302,8 +387,20 @@ class DataImporter:
         logger.info(f"从 {source_type} 数据源导入数据: {connection_string}")
 
         source = DataImporter.create_source(source_type, connection_string)
+        return DataImporter._iter_and_close(source)
 
+    @staticmethod
+    def _iter_and_close(source: DataSource) -> Iterator[PatientRecord]:
+        """
+        逐条生成数据源的患者记录，结束后关闭数据源
+
+        Args:
+            source: 数据源对象
+
+        Yields:
+            患者记录
+        """
         try:
-            return source.load_data()
+            yield from source.load_data_iter()
         finally:
             source.close()
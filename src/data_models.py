@@ -1,27 +1,46 @@
 """
 数据模型定义
-使用 Pydantic 进行数据验证
+使用 Pydantic 进行数据验证 (EventInfo除外，见其说明)
 """
 
+from dataclasses import asdict, dataclass
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date
 from pydantic import BaseModel, validator, Field
 
 
-class EventInfo(BaseModel):
-    """事件信息模型"""
+@dataclass
+class EventInfo:
+    """
+    事件信息模型
 
-    event_type: str = Field(..., description="事件类型")
-    event_date: date = Field(..., description="事件发生日期")
-    days_from_enrollment: int = Field(..., description="距离入组时间的天数")
-    data_source: Optional[str] = Field(None, description="数据来源字段")
+    每个检测到的事件都会创建一个实例，且字段值均由EventProcessor解析校验后传入，
+    因此使用普通dataclass而非Pydantic模型，省去逐个实例的验证开销。
 
-    class Config:
-        json_encoders = {date: lambda v: v.isoformat()}
+    Attributes:
+        event_type: 事件类型
+        event_date: 事件发生日期
+        days_from_enrollment: 距离入组时间的天数
+        data_source: 数据来源字段
+    """
+
+    event_type: str
+    event_date: date
+    days_from_enrollment: int
+    data_source: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return asdict(self)
 
 
 class PatientRecord(BaseModel):
-    """患者基本信息模型"""
+    """
+    患者基本信息模型
+
+    入组日期不在未来的检查由数据导入器在导入时统一进行 (每次导入只取一次当天日期)，
+    模型本身不再逐个实例校验。
+    """
 
     patient_id: str = Field(..., description="患者ID")
     enrollment_date: date = Field(..., description="入组日期")
@@ -29,15 +48,6 @@ class PatientRecord(BaseModel):
     gender: Optional[str] = Field(None, description="性别")
     raw_data: Dict[str, Any] = Field(default_factory=dict, description="原始数据")
 
-    @validator("enrollment_date")
-    def validate_date(cls, v):
-        """验证日期不在未来"""
-        if isinstance(v, str):
-            v = datetime.fromisoformat(v).date()
-        if v > datetime.now().date():
-            raise ValueError("入组日期不能在未来")
-        return v
-
     class Config:
         json_encoders = {date: lambda v: v.isoformat()}
 
@@ -69,6 +79,30 @@ class FollowupRecord(BaseModel):
         """转换为字典"""
         return self.dict()
 
+    @classmethod
+    def to_columnar(cls, records: List["FollowupRecord"]) -> Dict[str, List[Any]]:
+        """
+        将多条记录转换为按列组织的字典 (用于一次性构建DataFrame，无需逐条构造字典)
+
+        Args:
+            records: 随访记录列表
+
+        Returns:
+            列名到值列表的映射，列顺序与to_flattened_dict一致
+        """
+        return {
+            "patient_id": [r.patient_id for r in records],
+            "enrollment_date": [r.enrollment_date.isoformat() for r in records],
+            "first_event_type": [r.first_event_type for r in records],
+            "first_event_date": [
+                r.first_event_date.isoformat() if r.first_event_date else None for r in records
+            ],
+            "days_to_first_event": [r.days_to_first_event for r in records],
+            "event_count": [r.event_count for r in records],
+            "notes": [r.notes for r in records],
+            "processing_timestamp": [r.processing_timestamp.isoformat() for r in records],
+        }
+
     def to_flattened_dict(self) -> Dict[str, Any]:
         """转换为展平的字典 (用于导出表格)"""
         return {
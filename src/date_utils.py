@@ -0,0 +1,44 @@
+"""
+日期解析工具
+事件处理和纵向数据导入共用的日期字符串解析
+"""
+
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Optional
+
+# 支持的字符串日期格式 (按优先级排列)
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+    "%d-%m-%Y",
+    "%d/%m/%Y",
+    "%Y%m%d",
+    "%m/%d/%Y",
+)
+
+
+@lru_cache(maxsize=65536)
+def parse_date_string(value: str) -> Optional[date]:
+    """
+    按支持的格式解析日期字符串 (结果会被缓存，同一日期字符串只解析一次)
+
+    Args:
+        value: 已去除首尾空白的日期字符串
+
+    Returns:
+        解析后的日期，或None如果所有格式都无法解析
+    """
+    # 年在前的格式 (YYYY-MM-DD / YYYY/MM/DD) 最常见，先用C实现的fromisoformat快速解析
+    if len(value) == 10 and value[4] == value[7] and value[4] in "-/":
+        try:
+            return date.fromisoformat(value.replace("/", "-"))
+        except ValueError:
+            pass
+
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
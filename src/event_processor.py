@@ -4,13 +4,20 @@
 """
 
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
 from datetime import date, datetime, timedelta
 from .config import Config
 from .data_models import EventInfo, PatientRecord, FollowupRecord
+from .date_utils import parse_date_string
 
 logger = logging.getLogger(__name__)
 
+# 多进程处理时每个任务包含的患者数 (较大的块可摊薄进程间通信开销)
+PROCESS_CHUNK_SIZE = 512
+
 
 class EventProcessor:
     """事件处理器 - 识别和处理患者事件"""
@@ -27,6 +34,28 @@ class EventProcessor:
         self.max_days = config.get("processing.max_days_from_enrollment", 36500)
         self.invalid_date_handling = config.get("processing.invalid_date_handling", "skip")
 
+        # 每种事件类型及其字段名 (构造时计算一次，避免逐个患者重复查找配置)
+        self._event_specs: Tuple[Tuple[str, Tuple[str, ...]], ...] = tuple(
+            (event_type, tuple(event_config.get("field_names", [])))
+            for event_type, event_config in self.event_types.items()
+        )
+
+        # 事件类型优先级 (数字越小优先级越高)
+        self._priority_order: Dict[str, float] = {
+            event_type: event_config.get("priority", float("inf"))
+            for event_type, event_config in self.event_types.items()
+        }
+
+        # 所有事件字段 (按事件优先级排列)，用于快速跳过无事件数据的患者
+        self._event_fields: Tuple[str, ...] = tuple(
+            field_name
+            for _, event_config in sorted(
+                self.event_types.items(),
+                key=lambda item: item[1].get("priority", float("inf")),
+            )
+            for field_name in event_config.get("field_names", [])
+        )
+
     def extract_events_from_record(
         self,
         patient: PatientRecord,
@@ -44,9 +73,7 @@ class EventProcessor:
         raw_data = patient.raw_data
 
         # 遍历所有事件类型
-        for event_type, event_config in self.event_types.items():
-            field_names = event_config.get("field_names", [])
-
+        for event_type, field_names in self._event_specs:
             # 在原始数据中查找对应字段
             for field_name in field_names:
                 if field_name not in raw_data:
@@ -75,8 +102,11 @@ class EventProcessor:
                 )
                 events.append(event)
                 logger.debug(
-                    f"患者 {patient.patient_id}: 检测到事件 {event_type} "
-                    f"(字段: {field_name}, 日期: {parsed_date})"
+                    "患者 %s: 检测到事件 %s (字段: %s, 日期: %s)",
+                    patient.patient_id,
+                    event_type,
+                    field_name,
+                    parsed_date,
                 )
 
         # 按日期排序
@@ -84,6 +114,22 @@ class EventProcessor:
 
         return events
 
+    def _has_event_data(self, raw_data: Dict[str, Any]) -> bool:
+        """
+        判断原始数据中是否存在任何非空的事件字段
+
+        Args:
+            raw_data: 患者原始数据
+
+        Returns:
+            是否存在可能的事件数据
+        """
+        for field_name in self._event_fields:
+            value = raw_data.get(field_name)
+            if value is not None and str(value).strip() != "":
+                return True
+        return False
+
     def _parse_date(self, value: Any, event_type: str, field_name: str) -> Optional[date]:
         """
         解析日期值
@@ -112,26 +158,14 @@ class EventProcessor:
             if not value:
                 return None
 
-            # 尝试多种日期格式
-            date_formats = [
-                "%Y-%m-%d",
-                "%Y/%m/%d",
-                "%d-%m-%Y",
-                "%d/%m/%Y",
-                "%Y%m%d",
-                "%m/%d/%Y",
-            ]
-
-            for fmt in date_formats:
-                try:
-                    return datetime.strptime(value, fmt).date()
-                except ValueError:
-                    continue
+            parsed = parse_date_string(value)
+            if parsed is not None:
+                return parsed
 
             # 无法解析
             if self.invalid_date_handling == "skip":
                 logger.warning(
-                    f"无法解析日期值 '{value}' (事件类型: {event_type}, 字段: {field_name})"
+                    "无法解析日期值 '%s' (事件类型: %s, 字段: %s)", value, event_type, field_name
                 )
                 return None
             elif self.invalid_date_handling == "fill_with_null":
@@ -148,8 +182,11 @@ class EventProcessor:
             pass
 
         logger.warning(
-            f"无法识别日期格式 '{value}' (类型: {type(value).__name__}, "
-            f"事件类型: {event_type}, 字段: {field_name})"
+            "无法识别日期格式 '%s' (类型: %s, 事件类型: %s, 字段: %s)",
+            value,
+            type(value).__name__,
+            event_type,
+            field_name,
         )
         return None
 
@@ -173,18 +210,18 @@ class EventProcessor:
             if validate:
                 # 验证时间范围
                 if days < 0:
-                    logger.debug(f"事件日期 {event_date} 早于入组日期 {enrollment_date}，已跳过")
+                    logger.debug("事件日期 %s 早于入组日期 %s，已跳过", event_date, enrollment_date)
                     return None
 
                 if days > self.max_days:
-                    logger.warning(f"事件日期与入组日期相差过大 ({days} 天)，可能数据错误")
+                    logger.warning("事件日期与入组日期相差过大 (%s 天)，可能数据错误", days)
                     if self.config.get("processing.skip_invalid_records"):
                         return None
 
             return days
 
         except Exception as e:
-            logger.error(f"计算天数差异时出错: {e}")
+            logger.error("计算天数差异时出错: %s", e)
             return None
 
     def find_first_event(
@@ -207,25 +244,13 @@ class EventProcessor:
 
         # 获取优先级配置
         if priority_order is None:
-            priority_order = {
-                event_type: config.get("priority", float("inf"))
-                for event_type, config in self.event_types.items()
-            }
-
-        # 按时间排序
-        events_sorted_by_time = sorted(events, key=lambda e: e.event_date)
-
-        # 找出最早发生的事件
-        first_event = events_sorted_by_time[0]
+            priority_order = self._priority_order
 
-        # 查找同一天或之后的其他事件中优先级更高的
-        earliest_date = first_event.event_date
-        same_date_events = [e for e in events if e.event_date == earliest_date]
-
-        if same_date_events:
-            # 按优先级排序
-            same_date_events.sort(key=lambda e: priority_order.get(e.event_type, float("inf")))
-            first_event = same_date_events[0]
+        # 一次遍历找出最早发生的事件，同一天的多个事件取优先级最高者
+        first_event = min(
+            events,
+            key=lambda e: (e.event_date, priority_order.get(e.event_type, float("inf"))),
+        )
 
         return first_event, len(events)
 
@@ -239,6 +264,13 @@ class EventProcessor:
         Returns:
             随访记录
         """
+        # 无任何事件字段的患者直接生成无事件记录
+        if not self._has_event_data(patient.raw_data):
+            return FollowupRecord(
+                patient_id=patient.patient_id,
+                enrollment_date=patient.enrollment_date,
+            )
+
         # 提取所有事件
         events = self.extract_events_from_record(patient)
 
@@ -257,3 +289,99 @@ class EventProcessor:
         )
 
         return followup
+
+    def process_patients(
+        self,
+        patients: Iterable[PatientRecord],
+        max_workers: Optional[int] = None,
+        chunksize: int = PROCESS_CHUNK_SIZE,
+    ) -> Iterator[FollowupRecord]:
+        """
+        使用多进程并行处理多个患者，按输入顺序生成随访记录
+
+        患者按窗口 (max_workers * chunksize 个) 分批提交: 当前窗口的结果被消费时，下一个窗口
+        已在处理，进程不会空闲；同时最多只有两个窗口的患者和结果在内存中，输入为迭代器时
+        不会被一次性读完。窗口越大进程越不易空等，但占用的内存越多。
+
+        Args:
+            patients: 患者记录 (列表或迭代器)
+            max_workers: 最大进程数 (None表示使用CPU核心数)
+            chunksize: 每个任务包含的患者数
+
+        Yields:
+            随访记录 (处理失败的患者会被跳过)
+        """
+        window = (max_workers or os.cpu_count() or 1) * chunksize
+        patients = iter(patients)
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(self,)
+        ) as executor:
+
+            def submit_window() -> Optional[Iterator[Optional[FollowupRecord]]]:
+                batch = list(islice(patients, window))
+                if not batch:
+                    return None
+                return executor.map(_process_patient_in_worker, batch, chunksize=chunksize)
+
+            results = submit_window()
+            while results is not None:
+                next_results = submit_window()
+                for followup in results:
+                    if followup is not None:
+                        yield followup
+                results = next_results
+
+    def process_batch(self, patients: Iterable[PatientRecord]) -> List[FollowupRecord]:
+        """
+        批量处理多个患者，生成随访记录列表
+
+        Args:
+            patients: 患者记录 (列表或迭代器，逐条消费)
+
+        Returns:
+            随访记录列表 (处理失败的患者会被跳过)
+        """
+        process_patient = self.process_patient
+        followup_records: List[FollowupRecord] = []
+
+        for patient in patients:
+            try:
+                followup_records.append(process_patient(patient))
+            except Exception as e:
+                logger.error("处理患者%s时出错: %s", patient.patient_id, e)
+                continue
+
+        return followup_records
+
+
+# 工作进程中的事件处理器 (由进程池initializer设置，每个进程只传递一次)
+_worker_processor: Optional[EventProcessor] = None
+
+
+def _init_worker(processor: EventProcessor) -> None:
+    """
+    初始化工作进程
+
+    Args:
+        processor: 事件处理器
+    """
+    global _worker_processor
+    _worker_processor = processor
+
+
+def _process_patient_in_worker(patient: PatientRecord) -> Optional[FollowupRecord]:
+    """
+    在工作进程中处理单个患者
+
+    Args:
+        patient: 患者记录
+
+    Returns:
+        随访记录，处理失败时返回None
+    """
+    try:
+        return _worker_processor.process_patient(patient)
+    except Exception as e:
+        logger.error("处理患者%s时出错: %s", patient.patient_id, e)
+        return None
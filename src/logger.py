@@ -2,9 +2,11 @@
 日志系统模块
 """
 
+import atexit
 import logging
+import multiprocessing
 import os
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 from pathlib import Path
 
@@ -52,9 +54,16 @@ def setup_logger(
     )
     file_handler.setLevel(getattr(logging, level))
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
 
-    # 控制台处理器
+    # 文件写入 (含轮转) 交给后台线程，避免磁盘I/O阻塞处理流程；程序退出时写完剩余日志。
+    # 使用进程间队列: fork出的工作进程 (如进程池) 继承QueueHandler后，日志也能由主进程写入文件
+    log_queue = multiprocessing.Queue(-1)
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    logger.addHandler(QueueHandler(log_queue))
+
+    # 控制台处理器 (同步输出，保持与print/input的先后顺序)
     console_handler = logging.StreamHandler()
     console_handler.setLevel(getattr(logging, level))
     console_handler.setFormatter(formatter)
@@ -2,18 +2,116 @@
 纵向数据导入模块 - 支持从多个Sheet导入并合并纵向数据
 """
 
+import functools
 import logging
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
-from typing import List, Dict, Optional, Tuple
+from typing import Any, Callable, List, Dict, Optional, Tuple, Union
 from pathlib import Path
 from datetime import date, datetime, timedelta
 import re
 
+from .data_importer import EXCEL_READ_ENGINE
+from .date_utils import parse_date_string
 from .longitudinal_models import LongitudinalPatientRecord, TimePointData
 from .logger import setup_logger
 
 logger = logging.getLogger(__name__)
 
+# Excel日期码的纪元日期（与pandas的origin="1899-12-30"相同，1900-03-01及之后的日期码与Excel一致）
+EXCEL_EPOCH = date(1899, 12, 30)
+
+# pd.read_excel 的 usecols 参数（需可哈希，用作缓存键）
+UseCols = Union[None, Tuple[str, ...], Callable[[str], bool]]
+
+# Sheet的行索引: (患者ID到首行数据字典的映射, 字段名到Sheet中实际存在的候选列名的映射)
+SheetIndex = Tuple[Dict[Any, Dict[str, Any]], Dict[str, Tuple[str, ...]]]
+
+
+@functools.lru_cache(maxsize=4)
+def _read_workbook(
+    file_path: str,
+    mtime_ns: int,
+    usecols: UseCols = None,
+    max_workers: int = 1,
+) -> Dict[str, pd.DataFrame]:
+    """
+    读取Excel文件的所有Sheet（按文件路径、修改时间和读取列缓存）
+
+    同一进程内重复加载同一文件（如依次处理多个终点事件）时直接复用解析结果，
+    文件被修改后修改时间变化，缓存自动失效。返回的DataFrame为共享对象，调用方不应原地修改。
+
+    Args:
+        file_path: Excel文件路径
+        mtime_ns: 文件修改时间（纳秒），仅用作缓存键
+        usecols: 只读取的列（列名元组或判断函数），None表示读取全部列
+        max_workers: 并行解析Sheet的进程数，默认1（单进程）
+
+    Returns:
+        Sheet名称到DataFrame的映射
+    """
+    sheets: Dict[str, pd.DataFrame] = {}
+
+    with pd.ExcelFile(file_path, engine=EXCEL_READ_ENGINE) as xls:
+        logger.info(f"加载Excel文件: {file_path}")
+        logger.info(f"发现{len(xls.sheet_names)}个Sheet")
+
+        max_workers = min(max_workers, len(xls.sheet_names))
+        if max_workers > 1 and _is_picklable(usecols):
+            # 在多个进程中并行解析（每个进程独立打开并解压工作簿，只适合Sheet多且大的文件）
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    (sheet_name, executor.submit(_read_sheet, file_path, sheet_name, usecols))
+                    for sheet_name in xls.sheet_names
+                ]
+            loaders = [(sheet_name, future.result) for sheet_name, future in futures]
+        else:
+            # 只打开一次工作簿，各Sheet都从同一个句柄解析（避免每个Sheet重新解压整个文件）
+            loaders = [
+                (sheet_name, functools.partial(xls.parse, sheet_name, usecols=usecols))
+                for sheet_name in xls.sheet_names
+            ]
+
+        for sheet_name, load in loaders:
+            try:
+                df = load()
+                sheets[sheet_name] = df
+                logger.debug("  加载Sheet: %s (%d行)", sheet_name, len(df))
+            except Exception as e:
+                logger.warning(f"  加载Sheet失败: {sheet_name} - {e}")
+                continue
+
+    return sheets
+
+
+def _read_sheet(file_path: str, sheet_name: str, usecols: UseCols = None) -> pd.DataFrame:
+    """
+    读取单个Sheet（在进程池的工作进程中运行）
+
+    Args:
+        file_path: Excel文件路径
+        sheet_name: Sheet名称
+        usecols: 只读取的列，None表示读取全部列
+
+    Returns:
+        Sheet数据
+    """
+    return pd.read_excel(
+        file_path, sheet_name=sheet_name, usecols=usecols, engine=EXCEL_READ_ENGINE
+    )
+
+
+def _is_picklable(obj) -> bool:
+    """判断对象能否传递给工作进程（如lambda形式的usecols不能）"""
+    try:
+        pickle.dumps(obj)
+    except Exception:
+        return False
+    return True
+
 
 class LongitudinalDataImporter:
     """纵向数据导入器 - 从多Sheet Excel文件导入纵向随访数据"""
@@ -51,6 +149,14 @@ class LongitudinalDataImporter:
         (r"第?120个?月", 120),
     ]
 
+    # 预编译的时间点正则（按TIME_POINT_PATTERNS的顺序匹配，先匹配的优先）
+    _TIME_POINT_REGEXES = tuple(
+        (re.compile(pattern), months) for pattern, months in TIME_POINT_PATTERNS
+    )
+
+    # 直接从数字提取月数的正则（例如 "6M" "12个月" 等）
+    _MONTHS_REGEX = re.compile(r"(\d+)\s*[Mm个月]")
+
     # 关键字段映射
     FIELD_MAPPING = {
         "patient_id": ["subjid", "patient_id"],
@@ -83,17 +189,61 @@ class LongitudinalDataImporter:
         "diagnosis": ["随访1 目前诊断", "diagnosis"],
     }
 
+    # 除FIELD_MAPPING外，导入和事件处理流程还会读取的列
+    EXTRA_COLUMNS = (
+        "sys_currentage",
+        "stsex",
+        "groupname",
+        "如有不良事件，何事件",
+        "adverse_event_type",
+    )
+
+    _REQUIRED_COLUMNS = frozenset(
+        column for candidates in FIELD_MAPPING.values() for column in candidates
+    ) | frozenset(EXTRA_COLUMNS)
+
     def __init__(self):
         """初始化导入器"""
         self.excel_file: Optional[str] = None
         self.sheet_data: Dict[str, pd.DataFrame] = {}
+        # Sheet名称到时间点信息的缓存（每个Sheet只解析一次，而非每个患者解析一次）
+        self._time_point_cache: Dict[str, Optional[Tuple[str, int]]] = {}
+        # 事件编码字符串到事件类型的缓存（编码组合很少，每种组合只解析一次）
+        self._event_code_cache: Dict[str, Tuple[str, ...]] = {}
+        # 每个DataFrame的行索引 (按id(df)缓存，并保存df本身以校验): 见_get_sheet_index
+        self._sheet_index: Dict[int, Tuple[pd.DataFrame, SheetIndex]] = {}
+
+    @classmethod
+    def is_required_column(cls, column: str) -> bool:
+        """
+        判断列是否为导入和事件处理所需（可作为load_excel_file的usecols参数）
+
+        冠脉CT相关列名不固定，凡列名包含"CT"的列均保留。
 
-    def load_excel_file(self, file_path: str) -> bool:
+        Args:
+            column: 列名
+
+        Returns:
+            是否需要读取该列
+        """
+        name = str(column)
+        return name in cls._REQUIRED_COLUMNS or "ct" in name.lower()
+
+    def load_excel_file(
+        self,
+        file_path: str,
+        usecols: UseCols = None,
+        max_workers: int = 1,
+    ) -> bool:
         """
         加载Excel文件并读取所有Sheet
 
         Args:
             file_path: Excel文件路径
+            usecols: 只读取的列（列名元组或判断函数，如is_required_column），
+                None表示读取全部列。只读取所需列可明显缩短解析时间，但raw_data中只包含这些列
+            max_workers: 并行解析Sheet的进程数，默认1（单进程，复用同一个工作簿句柄）；
+                0表示使用全部CPU核心。每个进程都要重新打开工作簿，只有Sheet多且大时才值得开启
 
         Returns:
             是否成功加载
@@ -102,41 +252,32 @@ class LongitudinalDataImporter:
             if not Path(file_path).exists():
                 raise FileNotFoundError(f"文件不存在: {file_path}")
 
-            xls = pd.ExcelFile(file_path)
+            # 加载所有Sheet（同一文件未修改时复用缓存）
+            resolved_path = str(Path(file_path).resolve())
+            mtime_ns = Path(resolved_path).stat().st_mtime_ns
+            max_workers = max_workers or os.cpu_count() or 1
+            self.sheet_data.update(_read_workbook(resolved_path, mtime_ns, usecols, max_workers))
             self.excel_file = file_path
 
-            logger.info(f"加载Excel文件: {file_path}")
-            logger.info(f"发现{len(xls.sheet_names)}个Sheet")
-
-            # 加载所有Sheet
-            for sheet_name in xls.sheet_names:
-                try:
-                    df = pd.read_excel(file_path, sheet_name=sheet_name)
-                    self.sheet_data[sheet_name] = df
-                    logger.debug(f"  加载Sheet: {sheet_name} ({len(df)}行)")
-                except Exception as e:
-                    logger.warning(f"  加载Sheet失败: {sheet_name} - {e}")
-                    continue
-
             return len(self.sheet_data) > 0
 
         except Exception as e:
             logger.error(f"加载Excel文件失败: {e}")
             return False
 
-    def _get_field_value(self, row: pd.Series, field_mapping_keys: List[str]) -> Optional:
+    def _get_field_value(self, row: Dict[str, Any], field_mapping_keys: List[str]) -> Optional:
         """
         从行数据中获取字段值（支持多个可能的列名）
 
         Args:
-            row: DataFrame行
+            row: 行数据字典（列名到值）
             field_mapping_keys: 可能的字段名列表
 
         Returns:
             字段值，或None
         """
         for key in field_mapping_keys:
-            if key in row.index:
+            if key in row:
                 value = row[key]
                 # 处理NaN
                 if pd.isna(value):
@@ -166,6 +307,23 @@ class LongitudinalDataImporter:
         if not code_str or code_str == "":
             return []
 
+        event_types = self._event_code_cache.get(code_str)
+        if event_types is None:
+            event_types = self._map_event_codes(code_str)
+            self._event_code_cache[code_str] = event_types
+
+        return list(event_types)
+
+    def _map_event_codes(self, code_str: str) -> Tuple[str, ...]:
+        """
+        将逗号分隔的事件编码字符串映射为事件类型
+
+        Args:
+            code_str: 事件编码字符串（例如 "5,6"）
+
+        Returns:
+            事件类型元组
+        """
         # 分割逗号分隔的编码
         codes = [c.strip() for c in code_str.split(",")]
 
@@ -176,9 +334,9 @@ class LongitudinalDataImporter:
                 event_types.append(self.EVENT_TYPE_CODES[code])
             else:
                 # 未知编码，记录警告
-                logger.debug(f"未识别的事件编码: {code}")
+                logger.debug("未识别的事件编码: %s", code)
 
-        return event_types
+        return tuple(event_types)
 
     def _parse_date(self, value) -> Optional[date]:
         """
@@ -204,29 +362,16 @@ class LongitudinalDataImporter:
             if not value:
                 return None
 
-            # 尝试多种日期格式
-            date_formats = [
-                "%Y-%m-%d",
-                "%Y/%m/%d",
-                "%d-%m-%Y",
-                "%d/%m/%Y",
-                "%Y%m%d",
-                "%m/%d/%Y",
-            ]
+            # 尝试多种日期格式 (与EventProcessor共用带缓存的解析，同一日期字符串只解析一次)
+            parsed = parse_date_string(value)
+            if parsed is None:
+                logger.debug("无法解析日期: %s", value)
+            return parsed
 
-            for fmt in date_formats:
-                try:
-                    return datetime.strptime(value, fmt).date()
-                except ValueError:
-                    continue
-
-            logger.debug(f"无法解析日期: {value}")
-            return None
-
-        # 尝试Excel日期码
+        # 尝试Excel日期码（按天数偏移纪元日期，与pd.to_datetime(unit="D", origin="1899-12-30")一致）
         try:
             if isinstance(value, (int, float)):
-                return date(1900, 1, 1) + timedelta(days=int(value) - 2)
+                return EXCEL_EPOCH + timedelta(days=int(value))
         except (ValueError, OverflowError):
             pass
 
@@ -242,17 +387,35 @@ class LongitudinalDataImporter:
         Returns:
             (时间点名称, 月数) 或 None
         """
-        for pattern, months in self.TIME_POINT_PATTERNS:
-            if re.search(pattern, sheet_name):
+        if sheet_name in self._time_point_cache:
+            return self._time_point_cache[sheet_name]
+
+        time_point_info = self._match_time_point(sheet_name)
+        if time_point_info is None:
+            logger.warning(f"无法从sheet名称提取时间点信息: {sheet_name}")
+        self._time_point_cache[sheet_name] = time_point_info
+        return time_point_info
+
+    def _match_time_point(self, sheet_name: str) -> Optional[Tuple[str, int]]:
+        """
+        使用正则从sheet名称匹配时间点信息
+
+        Args:
+            sheet_name: Sheet名称
+
+        Returns:
+            (时间点名称, 月数) 或 None
+        """
+        for regex, months in self._TIME_POINT_REGEXES:
+            if regex.search(sheet_name):
                 return (sheet_name, months)  # 返回完整sheet名称作为时间点名称
 
         # 尝试直接从数字提取月数（例如 "6M" "12个月" 等）
-        match = re.search(r"(\d+)\s*[Mm个月]", sheet_name)
+        match = self._MONTHS_REGEX.search(sheet_name)
         if match:
             months = int(match.group(1))
             return (sheet_name, months)
 
-        logger.warning(f"无法从sheet名称提取时间点信息: {sheet_name}")
         return None
 
     def import_longitudinal_data(self) -> List[LongitudinalPatientRecord]:
@@ -267,23 +430,29 @@ class LongitudinalDataImporter:
             return []
 
         # 首先获取患者列表（从第一个Sheet）
-        first_sheet = list(self.sheet_data.values())[0]
+        first_sheet = next(iter(self.sheet_data.values()))
         patient_ids = self._get_unique_patients(first_sheet)
 
         logger.info(f"发现{len(patient_ids)}个患者")
 
+        # 基本信息Sheet对所有患者相同，只查找一次
+        basic_info_df = self._get_basic_info_sheet()
+
         # 为每个患者创建纵向记录
         longitudinal_records: List[LongitudinalPatientRecord] = []
 
         for patient_id in patient_ids:
             try:
-                record = self._create_longitudinal_record(patient_id)
+                record = self._create_longitudinal_record(patient_id, basic_info_df)
                 if record:
                     longitudinal_records.append(record)
             except Exception as e:
                 logger.warning(f"处理患者{patient_id}时出错: {e}")
                 continue
 
+        # 导入完成后释放各Sheet的行字典（每条记录的raw_data已有自己的副本）
+        self._sheet_index.clear()
+
         logger.info(f"成功创建{len(longitudinal_records)}条纵向患者记录")
         return longitudinal_records
 
@@ -295,6 +464,43 @@ class LongitudinalDataImporter:
                 return df[col].unique().tolist()
         return []
 
+    def _get_sheet_index(self, df: pd.DataFrame) -> SheetIndex:
+        """
+        获取Sheet的行索引（每个Sheet只构建一次）
+
+        首次访问某个Sheet时用to_dict一次性把整个Sheet转换为行字典，并按subjid建立哈希索引，
+        之后每个患者的查找都是O(1)，也无需逐行构造Series、逐个字段访问Series。
+        同时把FIELD_MAPPING的候选列名筛选为Sheet中实际存在的列，避免逐行逐个尝试不存在的列。
+        Sheet的DataFrame是共享的缓存对象，因此索引单独保存而不修改df。
+
+        Args:
+            df: Sheet数据
+
+        Returns:
+            (患者ID到首行数据字典的映射, 字段名到实际存在的候选列名的映射)
+        """
+        cached = self._sheet_index.get(id(df))
+        if cached is not None and cached[0] is df:
+            return cached[1]
+
+        rows: Dict[Any, Dict[str, Any]] = {}
+        if "subjid" in df.columns:
+            for row in df.to_dict(orient="records"):
+                subjid = row["subjid"]
+                # 与按列比较一致: 缺失的ID不匹配任何患者
+                if subjid is not None and subjid == subjid:
+                    rows.setdefault(subjid, row)
+
+        columns = set(df.columns)
+        fields = {
+            field: tuple(column for column in candidates if column in columns)
+            for field, candidates in self.FIELD_MAPPING.items()
+        }
+
+        index = (rows, fields)
+        self._sheet_index[id(df)] = (df, index)
+        return index
+
     def _get_basic_info_sheet(self) -> Optional[pd.DataFrame]:
         """
         查找并返回基本信息Sheet（通常命名为'***基本信息'）
@@ -310,7 +516,7 @@ class LongitudinalDataImporter:
 
         # 如果没有找到，返回第一个sheet
         if self.sheet_data:
-            first_sheet_name = list(self.sheet_data.keys())[0]
+            first_sheet_name = next(iter(self.sheet_data))
             logger.warning(f"未找到'基本信息'Sheet，使用第一个Sheet: {first_sheet_name}")
             return self.sheet_data[first_sheet_name]
 
@@ -337,40 +543,35 @@ class LongitudinalDataImporter:
         }
 
         # 查找该患者在基本信息表中的行
-        patient_rows = (
-            basic_info_df[basic_info_df["subjid"] == patient_id]
-            if "subjid" in basic_info_df.columns
-            else None
-        )
+        rows, fields = self._get_sheet_index(basic_info_df)
+        row = rows.get(patient_id)
 
-        if patient_rows is None or len(patient_rows) == 0:
-            logger.debug(f"患者{patient_id}在基本信息表中无数据")
+        if row is None:
+            logger.debug("患者%s在基本信息表中无数据", patient_id)
             return basic_info
 
-        row = patient_rows.iloc[0]
-
         # 提取姓名
-        name_value = self._get_field_value(row, self.FIELD_MAPPING["patient_name"])
+        name_value = self._get_field_value(row, fields["patient_name"])
         if name_value is not None:
             basic_info["name"] = str(name_value)
 
         # 提取生日
-        birthday_value = self._get_field_value(row, self.FIELD_MAPPING["birthday"])
+        birthday_value = self._get_field_value(row, fields["birthday"])
         basic_info["birthday"] = self._parse_date(birthday_value)
 
         # 提取入组日期
-        enroll_date = self._get_field_value(row, self.FIELD_MAPPING["enrollment_date"])
+        enroll_date = self._get_field_value(row, fields["enrollment_date"])
         basic_info["enrollment_date"] = self._parse_date(enroll_date)
 
         # 提取年龄
-        if "sys_currentage" in row.index and pd.notna(row["sys_currentage"]):
+        if "sys_currentage" in row and pd.notna(row["sys_currentage"]):
             try:
                 basic_info["age"] = int(row["sys_currentage"])
             except (ValueError, TypeError):
                 pass
 
         # 提取性别
-        if "stsex" in row.index:
+        if "stsex" in row:
             gender_value = row["stsex"]
             if pd.notna(gender_value):
                 try:
@@ -380,17 +581,20 @@ class LongitudinalDataImporter:
                     basic_info["gender"] = str(gender_value)
 
         # 提取分组
-        if "groupname" in row.index:
+        if "groupname" in row:
             basic_info["group_name"] = row["groupname"] if pd.notna(row["groupname"]) else None
 
         return basic_info
 
-    def _create_longitudinal_record(self, patient_id: str) -> Optional[LongitudinalPatientRecord]:
+    def _create_longitudinal_record(
+        self, patient_id: str, basic_info_df: Optional[pd.DataFrame] = None
+    ) -> Optional[LongitudinalPatientRecord]:
         """
         为单个患者创建纵向记录
 
         Args:
             patient_id: 患者ID
+            basic_info_df: 基本信息Sheet（批量导入时预先查找一次传入），None表示在此查找
 
         Returns:
             LongitudinalPatientRecord或None
@@ -398,7 +602,8 @@ class LongitudinalDataImporter:
         time_points: List[TimePointData] = []
 
         # 首先从基本信息表中提取患者基本信息
-        basic_info_df = self._get_basic_info_sheet()
+        if basic_info_df is None:
+            basic_info_df = self._get_basic_info_sheet()
         basic_info = (
             self._extract_basic_info(patient_id, basic_info_df) if basic_info_df is not None else {}
         )
@@ -415,27 +620,26 @@ class LongitudinalDataImporter:
             # 提取时间点信息
             time_point_info = self._extract_time_point_info(sheet_name)
             if not time_point_info:
-                logger.debug(f"无法识别Sheet的时间点: {sheet_name}")
+                logger.debug("无法识别Sheet的时间点: %s", sheet_name)
                 continue
 
             time_point_name, months = time_point_info
 
             # 找到该患者在该Sheet中的数据
-            patient_rows = df[df["subjid"] == patient_id] if "subjid" in df.columns else None
+            rows, fields = self._get_sheet_index(df)
+            row = rows.get(patient_id)
 
-            if patient_rows is None or len(patient_rows) == 0:
-                logger.debug(f"患者{patient_id}在Sheet{sheet_name}中无数据")
+            if row is None:
+                logger.debug("患者%s在Sheet%s中无数据", patient_id, sheet_name)
                 continue
 
-            row = patient_rows.iloc[0]
-
             # 如果基本信息表中没有入组日期，尝试从当前sheet获取（向后兼容）
             if patient_enrollment_date is None:
-                enroll_date = self._get_field_value(row, self.FIELD_MAPPING["enrollment_date"])
+                enroll_date = self._get_field_value(row, fields["enrollment_date"])
                 patient_enrollment_date = self._parse_date(enroll_date)
 
             # 提取时间点数据
-            time_point_data = self._extract_time_point_data(row, time_point_name, months)
+            time_point_data = self._extract_time_point_data(row, time_point_name, months, fields)
             time_points.append(time_point_data)
 
         if patient_enrollment_date is None:
@@ -460,36 +664,47 @@ class LongitudinalDataImporter:
         return record
 
     def _extract_time_point_data(
-        self, row: pd.Series, time_point_name: str, months: int
+        self,
+        row: Dict[str, Any],
+        time_point_name: str,
+        months: int,
+        fields: Optional[Dict[str, Tuple[str, ...]]] = None,
     ) -> TimePointData:
         """
         从行数据中提取单个时间点的随访数据
 
         Args:
-            row: DataFrame行
+            row: 行数据字典（列名到值）
             time_point_name: 时间点名称
             months: 距入组的月数
+            fields: 字段名到候选列名的映射（通常为该Sheet中实际存在的列），None表示FIELD_MAPPING
 
         Returns:
             TimePointData对象
         """
-        visit_date = self._parse_date(self._get_field_value(row, self.FIELD_MAPPING["visit_date"]))
-        death_date = self._parse_date(self._get_field_value(row, self.FIELD_MAPPING["death_date"]))
+        if fields is None:
+            fields = self.FIELD_MAPPING
+
+        def _text(field: str) -> Optional[str]:
+            """获取字段值并转换为字符串（空值返回None），每个字段只查找一次"""
+            value = self._get_field_value(row, fields[field])
+            return str(value) if value else None
+
+        visit_date = self._parse_date(self._get_field_value(row, fields["visit_date"]))
+        death_date = self._parse_date(self._get_field_value(row, fields["death_date"]))
         intervention_date = self._parse_date(
-            self._get_field_value(row, self.FIELD_MAPPING["intervention_date"])
-        )
-        bypass_date = self._parse_date(
-            self._get_field_value(row, self.FIELD_MAPPING["bypass_date"])
+            self._get_field_value(row, fields["intervention_date"])
         )
+        bypass_date = self._parse_date(self._get_field_value(row, fields["bypass_date"]))
         revascularization_date = self._parse_date(
-            self._get_field_value(row, self.FIELD_MAPPING["revascularization_date"])
+            self._get_field_value(row, fields["revascularization_date"])
         )
 
-        loss_to_followup_value = self._get_field_value(row, self.FIELD_MAPPING["loss_to_followup"])
+        loss_to_followup_value = self._get_field_value(row, fields["loss_to_followup"])
         is_lost = bool(loss_to_followup_value) if loss_to_followup_value is not None else False
 
         # 解析事件类型编码
-        event_type_value = self._get_field_value(row, self.FIELD_MAPPING["event_type"])
+        event_type_value = self._get_field_value(row, fields["event_type"])
         event_types = self._parse_event_codes(event_type_value)
 
         return TimePointData(
@@ -497,62 +712,22 @@ class LongitudinalDataImporter:
             months=months,
             visit_date=visit_date,
             is_lost_to_followup=is_lost,
-            loss_reason=(
-                str(self._get_field_value(row, self.FIELD_MAPPING["loss_reason"]))
-                if self._get_field_value(row, self.FIELD_MAPPING["loss_reason"])
-                else None
-            ),
+            loss_reason=_text("loss_reason"),
             death_date=death_date,
-            death_reason=(
-                str(self._get_field_value(row, self.FIELD_MAPPING["death_reason"]))
-                if self._get_field_value(row, self.FIELD_MAPPING["death_reason"])
-                else None
-            ),
-            cardiovascular_event=(
-                str(self._get_field_value(row, self.FIELD_MAPPING["cardiovascular_event"]))
-                if self._get_field_value(row, self.FIELD_MAPPING["cardiovascular_event"])
-                else None
-            ),
+            death_reason=_text("death_reason"),
+            cardiovascular_event=_text("cardiovascular_event"),
             event_types=event_types,  # 新增：解析后的事件类型列表
-            coronary_intervention=(
-                str(self._get_field_value(row, self.FIELD_MAPPING["coronary_intervention"]))
-                if self._get_field_value(row, self.FIELD_MAPPING["coronary_intervention"])
-                else None
-            ),
+            coronary_intervention=_text("coronary_intervention"),
             intervention_date=intervention_date,
-            coronary_bypass=(
-                str(self._get_field_value(row, self.FIELD_MAPPING["coronary_bypass"]))
-                if self._get_field_value(row, self.FIELD_MAPPING["coronary_bypass"])
-                else None
-            ),
+            coronary_bypass=_text("coronary_bypass"),
             bypass_date=bypass_date,
-            revascularization_treatment=(
-                str(self._get_field_value(row, self.FIELD_MAPPING["revascularization_treatment"]))
-                if self._get_field_value(row, self.FIELD_MAPPING["revascularization_treatment"])
-                else None
-            ),
-            revascularization_type=(
-                str(self._get_field_value(row, self.FIELD_MAPPING["revascularization_type"]))
-                if self._get_field_value(row, self.FIELD_MAPPING["revascularization_type"])
-                else None
-            ),
+            revascularization_treatment=_text("revascularization_treatment"),
+            revascularization_type=_text("revascularization_type"),
             revascularization_date=revascularization_date,
-            revascularization_detail=(
-                str(self._get_field_value(row, self.FIELD_MAPPING["revascularization_detail"]))
-                if self._get_field_value(row, self.FIELD_MAPPING["revascularization_detail"])
-                else None
-            ),
-            current_symptoms=(
-                str(self._get_field_value(row, self.FIELD_MAPPING["symptoms"]))
-                if self._get_field_value(row, self.FIELD_MAPPING["symptoms"])
-                else None
-            ),
-            current_diagnosis=(
-                str(self._get_field_value(row, self.FIELD_MAPPING["diagnosis"]))
-                if self._get_field_value(row, self.FIELD_MAPPING["diagnosis"])
-                else None
-            ),
-            raw_data=row.to_dict(),
+            revascularization_detail=_text("revascularization_detail"),
+            current_symptoms=_text("symptoms"),
+            current_diagnosis=_text("diagnosis"),
+            raw_data=row,  # Pydantic验证时会复制字典，无需先复制一次
         )
 
     def _calculate_latest_followup(self, record: LongitudinalPatientRecord) -> None:
@@ -580,11 +755,13 @@ class LongitudinalDataImporter:
                     record.days_to_latest_followup = delta.days
 
                 logger.debug(
-                    f"患者{record.patient_id}: 最晚随访时间点 = {time_point.time_point}, "
-                    f"日期 = {time_point.visit_date}, "
-                    f"天数差异 = {record.days_to_latest_followup}"
+                    "患者%s: 最晚随访时间点 = %s, 日期 = %s, 天数差异 = %s",
+                    record.patient_id,
+                    time_point.time_point,
+                    time_point.visit_date,
+                    record.days_to_latest_followup,
                 )
                 return
 
         # 如果没有随访日期，记录为None
-        logger.debug(f"患者{record.patient_id}: 无有效随访日期")
+        logger.debug("患者%s: 无有效随访日期", record.patient_id)
@@ -2,9 +2,9 @@
 纵向数据模型 - 支持多时间点随访数据
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, date
-from pydantic import BaseModel, validator, Field
+from pydantic import BaseModel, validator, Field, PrivateAttr
 
 
 class TimePointData(BaseModel):
@@ -208,18 +208,57 @@ class LongitudinalFollowupRecord(BaseModel):
 
     processing_timestamp: datetime = Field(default_factory=datetime.now, description="处理时间戳")
 
+    # 展平字典缓存（同一记录导出多次时避免重复构建）: (构建时的字段字典, 展平字典)
+    # 复制记录（model_copy/copy等）会生成新的字段字典，副本因此不会沿用原记录的缓存
+    _flat_cache: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = PrivateAttr(default=None)
+
     class Config:
         json_encoders = {
             date: lambda v: v.isoformat() if v else None,
             datetime: lambda v: v.isoformat(),
         }
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        # 字段被修改后使展平缓存失效
+        if not name.startswith("_"):
+            self._flat_cache = None
+
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
         return self.dict()
 
+    @classmethod
+    def to_columnar(cls, records: List["LongitudinalFollowupRecord"]) -> Dict[str, List[Any]]:
+        """
+        将多条记录转换为按列组织的字典（用于一次性构建DataFrame）
+
+        Args:
+            records: 随访记录列表
+
+        Returns:
+            列名到值列表的映射，列顺序与to_flattened_dict一致
+        """
+        columns: Dict[str, List[Any]] = {}
+        for record in records:
+            for key, value in record._get_flattened().items():
+                columns.setdefault(key, []).append(value)
+        return columns
+
     def to_flattened_dict(self) -> Dict[str, Any]:
-        """转换为展平的字典（用于导出表格）"""
+        """转换为展平的字典（用于导出表格），记录未修改时复用缓存结果"""
+        return dict(self._get_flattened())
+
+    def _get_flattened(self) -> Dict[str, Any]:
+        """获取缓存的展平字典（内部使用，返回值不得修改）"""
+        cache = self._flat_cache
+        if cache is None or cache[0] is not self.__dict__:
+            cache = (self.__dict__, self._build_flattened_dict())
+            self._flat_cache = cache
+        return cache[1]
+
+    def _build_flattened_dict(self) -> Dict[str, Any]:
+        """构建展平的字典"""
         return {
             "patient_id": self.patient_id,
             "patient_name": self.patient_name,
@@ -155,6 +155,8 @@ class LongitudinalEventProcessor:
 
         # 按时间点月数排序
         sorted_time_points = sorted(patient_record.time_points, key=lambda tp: tp.months)
+        enrollment_date = patient_record.enrollment_date
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
 
         # 遍历所有时间点，识别所有事件
         for time_point in sorted_time_points:
@@ -165,19 +167,21 @@ class LongitudinalEventProcessor:
                 if event_type and event_date:
                     # 计算距入组天数
                     days_to_event = None
-                    if patient_record.enrollment_date:
-                        days_to_event = (event_date - patient_record.enrollment_date).days
+                    if enrollment_date:
+                        days_to_event = (event_date - enrollment_date).days
 
                     # 更新该事件类型的首次发生（如果尚未记录）
-                    if event_type in event_tracking and event_tracking[event_type]["date"] is None:
-                        event_tracking[event_type]["date"] = event_date
-                        event_tracking[event_type]["time_point"] = time_point.time_point
-                        event_tracking[event_type]["days"] = days_to_event
-
-                        logger.debug(
-                            f"患者{patient_record.patient_id}: "
-                            f"{event_type} @ {time_point.time_point} ({event_date})"
-                        )
+                    tracked = event_tracking.get(event_type)
+                    if tracked is not None and tracked["date"] is None:
+                        tracked["date"] = event_date
+                        tracked["time_point"] = time_point.time_point
+                        tracked["days"] = days_to_event
+
+                        if debug_enabled:
+                            logger.debug(
+                                f"患者{patient_record.patient_id}: "
+                                f"{event_type} @ {time_point.time_point} ({event_date})"
+                            )
 
                     # 更新整体首次事件（任意类型的最早事件）
                     if first_event_date is None or event_date < first_event_date:
@@ -187,14 +191,12 @@ class LongitudinalEventProcessor:
                         first_event_months = time_point.months
 
             # 追踪冠脉相关检查/治疗（从raw_data或字段中提取）
-            self._track_coronary_procedures(
-                time_point, coronary_tracking, patient_record.enrollment_date
-            )
+            self._track_coronary_procedures(time_point, coronary_tracking, enrollment_date)
 
         # 计算整体首次事件距入组天数
         days_to_first_event: Optional[int] = None
-        if first_event_date is not None and patient_record.enrollment_date is not None:
-            delta = first_event_date - patient_record.enrollment_date
+        if first_event_date is not None and enrollment_date is not None:
+            delta = first_event_date - enrollment_date
             days_to_first_event = delta.days
 
         # 根据指定的终点事件计算生存结局
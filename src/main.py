@@ -42,21 +42,21 @@ def main(config_path: str = "config/config.yaml") -> int:
         logger.info(f"配置文件: {config_path}")
         logger.info("=" * 50)
 
-        # 导入数据
-        logger.info("正在导入患者数据...")
+        # 导入并处理数据 (逐条读取患者记录并处理，无需一次性持有所有患者记录)
+        logger.info("正在导入并处理患者数据...")
         patients = DataImporter.import_from_config(config)
-        logger.info(f"成功导入 {len(patients)} 条患者记录")
+        event_processor = EventProcessor(config)
+        max_workers = config.get("processing.max_workers", 1)
+        if max_workers == 1:
+            followup_records = event_processor.process_batch(patients)
+        else:
+            followup_records = list(event_processor.process_patients(patients, max_workers or None))
+        logger.info(f"成功处理 {len(followup_records)} 条患者记录")
 
-        if not patients:
+        if not followup_records:
             logger.warning("未导入任何患者数据，程序退出")
             return 1
 
-        # 处理事件
-        logger.info("正在处理患者事件...")
-        event_processor = EventProcessor(config)
-        followup_records = [event_processor.process_patient(patient) for patient in patients]
-        logger.info(f"成功处理 {len(followup_records)} 条患者记录")
-
         # 导出数据
         logger.info("正在导出随访数据...")
         exporter = FollowupExporter(config)
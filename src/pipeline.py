@@ -0,0 +1,160 @@
+"""
+纵向随访数据处理流程 - 从单个Excel文件导入、处理并导出结果
+"""
+
+import argparse
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Collection, Dict, List, NamedTuple, Optional, Sequence
+
+import pandas as pd
+
+from .data_exporter import fast_to_csv, fast_to_excel
+from .longitudinal_importer import LongitudinalDataImporter
+from .longitudinal_models import LongitudinalFollowupRecord
+from .longitudinal_processor import LongitudinalEventProcessor
+
+logger = logging.getLogger(__name__)
+
+# 生存分析CSV的默认列
+SURVIVAL_COLUMNS = (
+    "patient_id",
+    "patient_name",
+    "birthday",
+    "age",
+    "gender",
+    "group_name",
+    "enrollment_date",
+    "survival_time_days",
+    "event_occurred",
+    "endpoint_event",
+)
+
+# 可选的输出格式: excel=完整结果Excel, csv=生存分析CSV, parquet=完整结果Parquet（需要pyarrow）
+EMIT_FORMATS = ("excel", "csv", "parquet")
+DEFAULT_EMIT = ("excel", "csv")
+
+
+class PipelineResult(NamedTuple):
+    """处理流程的输出"""
+
+    followup_records: List[LongitudinalFollowupRecord]
+    df: pd.DataFrame
+    output_files: Dict[str, Path]
+
+
+def run_pipeline(
+    excel_file_path: str,
+    output_dir: Path,
+    endpoint: str = "death",
+    excel_name: str = "longitudinal_output",
+    survival_name: str = "survival",
+    survival_cols: Sequence[str] = SURVIVAL_COLUMNS,
+    sheet_name: str = "Followup Data",
+    emit: Collection[str] = DEFAULT_EMIT,
+) -> Optional[PipelineResult]:
+    """
+    运行完整处理流程: 加载Excel → 导入纵向记录 → 处理事件 → 导出结果
+
+    Args:
+        excel_file_path: 输入Excel文件路径
+        output_dir: 输出目录
+        endpoint: 生存分析终点事件
+        excel_name: 输出Excel文件名前缀 (后接时间戳)
+        survival_name: 生存分析CSV文件名前缀 (后接时间戳)
+        survival_cols: 生存分析CSV的列 (不存在的列会被忽略)
+        sheet_name: 输出Excel的工作表名称
+        emit: 要导出的格式 (EMIT_FORMATS中的一个或多个)。只需生存分析数据时
+            只导出csv可省去最耗时的Excel写入
+
+    Returns:
+        处理结果 (output_files为输出格式到文件路径的映射，导出失败的格式不包含在内)，
+        加载Excel文件失败时返回None
+    """
+    # 导入数据
+    importer = LongitudinalDataImporter()
+    if not importer.load_excel_file(excel_file_path):
+        return None
+    longitudinal_records = importer.import_longitudinal_data()
+    logger.info(f"导入 {len(longitudinal_records)} 条纵向患者记录")
+
+    # 处理事件
+    processor = LongitudinalEventProcessor(endpoint=endpoint)
+    followup_records = processor.process_batch(longitudinal_records)
+    logger.info(f"处理 {len(followup_records)} 条随访记录 (终点: {endpoint})")
+
+    # 导出结果
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    df = pd.DataFrame(LongitudinalFollowupRecord.to_columnar(followup_records))
+    output_files: Dict[str, Path] = {}
+
+    if "excel" in emit:
+        excel_path = output_dir / f"{excel_name}_{timestamp}.xlsx"
+        fast_to_excel(df, str(excel_path), sheet_name=sheet_name)
+        output_files["excel"] = excel_path
+
+    if "parquet" in emit:
+        parquet_path = output_dir / f"{excel_name}_{timestamp}.parquet"
+        try:
+            df.to_parquet(str(parquet_path), index=False, compression="zstd")
+            output_files["parquet"] = parquet_path
+        except ImportError as e:
+            logger.warning(f"Parquet导出需要安装pyarrow: {e}")
+        except Exception as e:
+            logger.warning(f"Parquet导出失败: {e}")
+
+    if "csv" in emit:
+        survival_path = output_dir / f"{survival_name}_{timestamp}.csv"
+        try:
+            existing_cols = [c for c in survival_cols if c in df.columns]
+            fast_to_csv(df.loc[:, existing_cols], str(survival_path))
+            output_files["csv"] = survival_path
+        except Exception as e:
+            logger.warning(f"生存分析CSV导出失败: {e}")
+
+    return PipelineResult(followup_records, df, output_files)
+
+
+def add_emit_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    为命令行解析器添加输出格式参数 (--emit / --survival-only，二者互斥)
+
+    Args:
+        parser: 命令行解析器
+    """
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--emit",
+        action="append",
+        choices=[*EMIT_FORMATS, "all"],
+        help="输出格式，可重复指定 (默认: excel + csv)",
+    )
+    group.add_argument(
+        "--survival-only",
+        action="store_true",
+        help="只导出生存分析CSV，跳过最耗时的Excel写入 (等同于 --emit csv)",
+    )
+
+
+def parse_emit(values: Optional[List[str]], survival_only: bool = False) -> List[str]:
+    """
+    解析命令行 --emit 参数 ("all" 表示全部格式，未指定时使用默认格式)
+
+    Args:
+        values: --emit 参数值列表
+        survival_only: 是否只导出生存分析CSV
+
+    Returns:
+        要导出的格式列表
+    """
+    if survival_only:
+        return ["csv"]
+    if not values:
+        return list(DEFAULT_EMIT)
+    if "all" in values:
+        return list(EMIT_FORMATS)
+    return list(dict.fromkeys(values))
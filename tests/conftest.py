@@ -6,6 +6,8 @@ from pathlib import Path
 # 添加src目录到Python路径
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / "src"))
+# 添加scripts目录到Python路径 (脚本测试直接导入脚本模块)
+sys.path.insert(0, str(project_root / "scripts"))
 
 import pytest
 from datetime import date
@@ -37,3 +39,45 @@ def sample_patient_data():
         "death_date": date(2021, 6, 15),
         "mi_date": None,
     }
+
+
+@pytest.fixture
+def longitudinal_excel_file(tmp_path):
+    """示例纵向随访Excel文件（基本信息Sheet + 两个随访时间点Sheet）"""
+    import pandas as pd
+
+    ids = ["S001", "S002", "S003"]
+    sheets = {
+        "患者基本信息": pd.DataFrame(
+            {
+                "subjid": ids,
+                "stname": ["张三", "李四", "王五"],
+                "groupdate": ["2020-01-01", "2020-02-01", "2020-03-01"],
+                "sys_currentage": [60, None, 70],
+                "stsex": [1, 2, 1],
+                "groupname": ["A", "B", "A"],
+            }
+        ),
+        "第三个月随访": pd.DataFrame(
+            {
+                "subjid": ids,
+                "随访日期1": ["2020-04-01", "2020-05-01", "2020-06-01"],
+                "死亡时间1": [None, None, None],
+                "如有不良事件，何事件1": [None, "5", None],
+            }
+        ),
+        "第六个月随访": pd.DataFrame(
+            {
+                "subjid": ids,
+                "随访日期1": ["2020-07-01", "2020-08-01", "2020-09-01"],
+                "死亡时间1": [None, None, "2020-08-15"],
+                "如有不良事件，何事件1": [None, None, "1"],
+            }
+        ),
+    }
+
+    file_path = tmp_path / "patients.xlsx"
+    with pd.ExcelWriter(file_path) as writer:
+        for sheet_name, df in sheets.items():
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+    return file_path
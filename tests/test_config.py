@@ -1,10 +1,11 @@
 """配置模块测试"""
 
+import os
 import pytest
 from pathlib import Path
 import tempfile
 import yaml
-from src.config import Config
+from src.config import Config, _load_yaml
 
 
 class TestConfig:
@@ -83,3 +84,41 @@ class TestConfig:
                 config.validate()
         finally:
             Path(temp_path).unlink()
+
+    def test_reload_after_file_change(self, sample_config_dict):
+        """测试配置文件修改后重新加载"""
+        with tempfile.NamedTemporaryFile(
+            mode="w", suffix=".yaml", delete=False, encoding="utf-8"
+        ) as f:
+            yaml.dump(sample_config_dict, f)
+            temp_path = f.name
+
+        try:
+            config = Config(temp_path)
+            config.get_nested("data_source")["type"] = "excel"
+            assert Config(temp_path).get("data_source.type") == "csv"
+
+            sample_config_dict["data_source"]["type"] = "sqlite"
+            Path(temp_path).write_text(yaml.dump(sample_config_dict), encoding="utf-8")
+            os.utime(temp_path, ns=(0, 0))
+            assert Config(temp_path).get("data_source.type") == "sqlite"
+        finally:
+            Path(temp_path).unlink()
+
+    def test_parse_cached_for_unchanged_file(self, sample_config_dict):
+        """测试未修改的配置文件只解析一次"""
+        with tempfile.NamedTemporaryFile(
+            mode="w", suffix=".yaml", delete=False, encoding="utf-8"
+        ) as f:
+            yaml.dump(sample_config_dict, f)
+            temp_path = f.name
+
+        try:
+            _load_yaml.cache_clear()
+            first = Config(temp_path)
+            second = Config(temp_path)
+            assert _load_yaml.cache_info().misses == 1
+            assert _load_yaml.cache_info().hits == 1
+            assert first.get("data_source.type") == second.get("data_source.type") == "csv"
+        finally:
+            Path(temp_path).unlink()
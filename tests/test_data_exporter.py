@@ -0,0 +1,134 @@
+"""数据导出器测试"""
+
+from datetime import date
+
+import pandas as pd
+import pytest
+from openpyxl.writer.excel import ExcelWriter
+
+from src import data_exporter
+from src.data_exporter import CSVExporter, ExcelExporter, fast_to_csv, write_sheets_to_excel
+from src.data_models import FollowupRecord
+
+
+@pytest.fixture
+def followup_records():
+    """示例随访记录"""
+    return [
+        FollowupRecord(
+            patient_id="P001",
+            enrollment_date=date(2020, 1, 1),
+            first_event_type="death",
+            first_event_date=date(2021, 6, 15),
+            days_to_first_event=531,
+            event_count=1,
+        ),
+        FollowupRecord(patient_id="P002", enrollment_date=date(2020, 2, 1)),
+    ]
+
+
+@pytest.fixture(params=["xlsxwriter", "openpyxl"])
+def excel_engine(request, monkeypatch):
+    """分别使用xlsxwriter和openpyxl写入Excel"""
+    if request.param == "openpyxl":
+        monkeypatch.setattr(data_exporter, "xlsxwriter", None)
+    elif data_exporter.xlsxwriter is None:
+        pytest.skip("未安装xlsxwriter")
+    return request.param
+
+
+class TestExcelExport:
+    """Excel导出测试"""
+
+    def test_write_sheets_round_trip(self, tmp_path, excel_engine):
+        """测试多个工作表写入后可完整读回，缺失值为空单元格"""
+        output_path = tmp_path / "sheets.xlsx"
+        first = pd.DataFrame({"id": ["A", "B"], "value": [1.5, None]})
+        second = pd.DataFrame({"id": ["C"], "flag": [True]})
+
+        write_sheets_to_excel(iter([("first", first), ("second", second)]), str(output_path))
+
+        sheets = pd.read_excel(output_path, sheet_name=None)
+        assert list(sheets) == ["first", "second"]
+        pd.testing.assert_frame_equal(sheets["first"], first)
+        pd.testing.assert_frame_equal(sheets["second"], second)
+
+    def test_excel_exporter_round_trip(self, tmp_path, excel_engine, followup_records):
+        """测试ExcelExporter导出的内容与记录一致"""
+        output_path = tmp_path / "out" / "followup.xlsx"
+        ExcelExporter().export(followup_records, str(output_path))
+
+        df = pd.read_excel(output_path, sheet_name="Follow-up Data")
+        assert list(df.columns) == list(followup_records[0].to_flattened_dict())
+        assert df["patient_id"].tolist() == ["P001", "P002"]
+        assert df["first_event_date"].tolist()[0] == "2021-06-15"
+        assert pd.isna(df["first_event_type"].tolist()[1])
+
+    def test_openpyxl_save_failure_removes_partial_file(self, tmp_path, monkeypatch):
+        """测试openpyxl写入失败时删除不完整的文件并抛出异常"""
+        monkeypatch.setattr(data_exporter, "xlsxwriter", None)
+
+        write_data = ExcelWriter.write_data
+
+        def fail(self):
+            write_data(self)
+            raise OSError("disk full")
+
+        monkeypatch.setattr(ExcelWriter, "write_data", fail)
+        output_path = tmp_path / "broken.xlsx"
+
+        with pytest.raises(OSError):
+            write_sheets_to_excel([("data", pd.DataFrame({"a": [1]}))], str(output_path))
+        assert not output_path.exists()
+
+    def test_xlsxwriter_failure_removes_partial_file(self, tmp_path, monkeypatch):
+        """测试xlsxwriter写入中途失败时删除不完整的文件，关闭时的异常不掩盖原始异常"""
+        xlsxwriter = pytest.importorskip("xlsxwriter")
+
+        def sheets():
+            yield "first", pd.DataFrame({"a": [1, 2]})
+            raise ValueError("bad sheet")
+
+        output_path = tmp_path / "broken.xlsx"
+        with pytest.raises(ValueError, match="bad sheet"):
+            write_sheets_to_excel(sheets(), str(output_path))
+        assert not output_path.exists()
+
+        def fail_close(self):
+            raise OSError("close failed")
+
+        monkeypatch.setattr(xlsxwriter.Workbook, "close", fail_close)
+        with pytest.raises(ValueError, match="bad sheet"):
+            write_sheets_to_excel(sheets(), str(output_path))
+        assert not output_path.exists()
+
+
+class TestCSVExport:
+    """CSV导出测试"""
+
+    def test_csv_exporter_round_trip(self, tmp_path, followup_records):
+        """测试CSVExporter导出的内容与记录一致"""
+        output_path = tmp_path / "followup.csv"
+        CSVExporter().export(followup_records, str(output_path))
+
+        df = pd.read_csv(output_path, encoding="utf-8-sig")
+        assert list(df.columns) == list(followup_records[0].to_flattened_dict())
+        assert df["patient_id"].tolist() == ["P001", "P002"]
+        assert df["days_to_first_event"].tolist()[0] == 531
+
+    def test_fast_to_csv_matches_to_csv(self, tmp_path, followup_records):
+        """测试fast_to_csv的输出与df.to_csv相同，含缺失值的整数列按float格式写出"""
+        df = pd.DataFrame(FollowupRecord.to_columnar(followup_records))
+        survival = df.loc[:, ["patient_id", "first_event_type", "days_to_first_event"]]
+        output_path = tmp_path / "survival.csv"
+
+        fast_to_csv(survival, str(output_path))
+
+        expected_path = tmp_path / "expected.csv"
+        survival.to_csv(expected_path, index=False)
+        assert output_path.read_bytes() == expected_path.read_bytes()
+        assert output_path.read_text(encoding="utf-8").splitlines() == [
+            "patient_id,first_event_type,days_to_first_event",
+            "P001,death,531.0",
+            "P002,,",
+        ]
@@ -0,0 +1,112 @@
+"""数据导入器测试"""
+
+import subprocess
+import sys
+import textwrap
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+from src.data_importer import CSVDataSource, DataImporter
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    """示例CSV文件（含缺少字段、入组日期在未来的无效记录）"""
+    future = (date.today() + timedelta(days=30)).isoformat()
+    lines = [
+        "patient_id,enrollment_date,death_date,mi_date",
+        "P001,2020-01-01,2021-06-15,",
+        "P002,2020-02-01,,2020-05-01",
+        ",2020-03-01,,",
+        "P004,,,",
+        f"P005,{future},,",
+        "P006,2020-06-01,,",
+        "P007,2020-07-01,2022-01-01,2021-01-01",
+    ]
+    file_path = tmp_path / "patients.csv"
+    file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return file_path
+
+
+class TestCSVDataSource:
+    """CSVDataSource测试"""
+
+    def test_load_data(self, csv_file):
+        """测试读取CSV并跳过无效记录"""
+        records = CSVDataSource(str(csv_file)).load_data()
+
+        assert [r.patient_id for r in records] == ["P001", "P002", "P006", "P007"]
+        assert records[0].enrollment_date == date(2020, 1, 1)
+        # 缺失值为None而不是NaN
+        assert records[0].raw_data["death_date"] == "2021-06-15"
+        assert records[0].raw_data["mi_date"] is None
+
+    @pytest.mark.parametrize("chunksize", [1, 2, 3, 100])
+    def test_chunk_size_does_not_change_result(self, csv_file, chunksize):
+        """测试分块大小不影响读取结果"""
+        expected = CSVDataSource(str(csv_file)).load_data()
+        records = list(CSVDataSource(str(csv_file)).load_data_iter(chunksize=chunksize))
+
+        assert [r.patient_id for r in records] == [r.patient_id for r in expected]
+        assert [r.raw_data for r in records] == [r.raw_data for r in expected]
+
+    def test_row_chunks(self, csv_file):
+        """测试按块返回行字典"""
+        chunks = list(CSVDataSource(str(csv_file))._iter_row_chunks(3))
+
+        assert [len(rows) for rows in chunks] == [3, 3, 1]
+        assert chunks[0][0]["patient_id"] == "P001"
+        assert chunks[0][2]["patient_id"] is None
+
+
+class TestDataImporter:
+    """DataImporter测试"""
+
+    def test_create_source(self, csv_file):
+        """测试按类型创建数据源"""
+        assert isinstance(DataImporter.create_source("CSV", str(csv_file)), CSVDataSource)
+        with pytest.raises(ValueError):
+            DataImporter.create_source("json", str(csv_file))
+
+
+class TestExcelEngineFallback:
+    """未安装python-calamine时的Excel读取引擎测试"""
+
+    def test_read_xls_without_calamine(self, tmp_path):
+        """测试calamine不可用时由pandas按扩展名选择引擎，可以读取.xls文件"""
+        xlwt = pytest.importorskip("xlwt")
+        pytest.importorskip("xlrd")
+
+        xls_file = tmp_path / "patients.xls"
+        workbook = xlwt.Workbook()
+        sheet = workbook.add_sheet("patients")
+        for row_index, row in enumerate(
+            [("patient_id", "enrollment_date"), ("P001", "2020-01-01"), ("P002", "2020-02-01")]
+        ):
+            for col_index, value in enumerate(row):
+                sheet.write(row_index, col_index, value)
+        workbook.save(str(xls_file))
+
+        # 在子进程中屏蔽python_calamine，避免影响当前进程中已导入的模块
+        script = textwrap.dedent(f"""
+            import sys
+            sys.modules["python_calamine"] = None
+            from src.data_importer import EXCEL_READ_ENGINE, ExcelDataSource
+            from src.longitudinal_importer import LongitudinalDataImporter
+
+            assert EXCEL_READ_ENGINE is None, EXCEL_READ_ENGINE
+            records = ExcelDataSource({str(xls_file)!r}).load_data()
+            assert [r.patient_id for r in records] == ["P001", "P002"], records
+            importer = LongitudinalDataImporter()
+            assert importer.load_excel_file({str(xls_file)!r})
+            assert list(importer.sheet_data) == ["patients"]
+            """)
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=str(Path(__file__).parent.parent),
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, result.stderr
@@ -6,6 +6,7 @@ import tempfile
 import yaml
 from pathlib import Path
 from src.event_processor import EventProcessor
+from src.date_utils import parse_date_string
 from src.config import Config
 from src.data_models import PatientRecord, EventInfo
 
@@ -81,3 +82,81 @@ class TestEventProcessor:
         assert followup.patient_id == "P003"
         assert followup.first_event_type is None
         assert followup.days_to_first_event is None
+
+    def test_process_batch(self, processor):
+        """测试批量处理患者"""
+        patients = [
+            PatientRecord(
+                patient_id="P001",
+                enrollment_date=date(2020, 1, 1),
+                raw_data={"death_date": date(2021, 6, 15)},
+            ),
+            PatientRecord(patient_id="P002", enrollment_date=date(2020, 1, 1)),
+        ]
+        followups = processor.process_batch(patients)
+
+        assert [f.patient_id for f in followups] == ["P001", "P002"]
+        assert followups[0].first_event_type == "death"
+        assert followups[1].first_event_type is None
+
+    def test_process_patients_parallel(self, processor):
+        """测试多进程处理与单进程结果一致"""
+        patients = [
+            PatientRecord(
+                patient_id=f"P{i:03d}",
+                enrollment_date=date(2020, 1, 1),
+                raw_data={"death_date": "2021-06-15"} if i % 2 else {},
+            )
+            for i in range(10)
+        ]
+        followups = list(processor.process_patients(patients, max_workers=2, chunksize=3))
+
+        assert [f.patient_id for f in followups] == [p.patient_id for p in patients]
+        expected = processor.process_batch(patients)
+        assert [f.days_to_first_event for f in followups] == [
+            f.days_to_first_event for f in expected
+        ]
+
+    def test_process_patients_reads_input_in_windows(self, processor):
+        """测试多进程处理按窗口读取输入，不会一次性读完患者迭代器"""
+        consumed = []
+
+        def iter_patients():
+            for i in range(20):
+                consumed.append(i)
+                yield PatientRecord(patient_id=f"P{i:03d}", enrollment_date=date(2020, 1, 1))
+
+        followups = processor.process_patients(iter_patients(), max_workers=1, chunksize=2)
+        assert next(followups).patient_id == "P000"
+        # 每个窗口2个患者，最多读取当前窗口和下一个窗口
+        assert len(consumed) == 4
+
+        assert [f.patient_id for f in followups] == [f"P{i:03d}" for i in range(1, 20)]
+
+    def test_has_event_data(self, processor):
+        """测试事件字段快速判断"""
+        assert processor._has_event_data({"death_date": date(2021, 6, 15)})
+        assert not processor._has_event_data({"death_date": None, "mi_date": "  "})
+        assert not processor._has_event_data({"other_field": "2021-06-15"})
+
+    def test_parse_date_caches_string_values(self, processor):
+        """测试重复的日期字符串只解析一次，且不改变有歧义日期的解析结果"""
+        parse_date_string.cache_clear()
+        assert processor._parse_date("2020/03/04", "death", "death_date") == date(2020, 3, 4)
+        assert processor._parse_date(" 2020/03/04 ", "mi", "mi_date") == date(2020, 3, 4)
+        assert parse_date_string.cache_info().hits == 1
+
+        # 日在前的格式优先于月在前的格式，01/02/2020按日在前解析
+        assert processor._parse_date("12/31/2020", "death", "death_date") == date(2020, 12, 31)
+        assert processor._parse_date("01/02/2020", "death", "death_date") == date(2020, 2, 1)
+
+    def test_select_first_event_same_date_uses_priority(self, processor):
+        """测试同一天发生多个事件时按优先级选择首次事件"""
+        events = [
+            EventInfo(event_type="mi", event_date=date(2021, 3, 1), days_from_enrollment=425),
+            EventInfo(event_type="death", event_date=date(2021, 3, 1), days_from_enrollment=425),
+            EventInfo(event_type="mi", event_date=date(2021, 6, 15), days_from_enrollment=530),
+        ]
+        first_event, count = processor.find_first_event(events)
+        assert first_event.event_type == "death"
+        assert count == 3
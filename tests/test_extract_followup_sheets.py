@@ -0,0 +1,50 @@
+"""随访表提取脚本测试"""
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from extract_followup_sheets import extract_followup_sheets, extract_time_point_from_sheet_name
+
+
+@pytest.mark.parametrize(
+    "sheet_name, expected",
+    [
+        ("第三个月随访_CAGSFB1_627CAG随访表1", "3个月"),
+        ("第六月随访_CAGSFB1_627CAG随访表1", "6个月"),
+        ("第十个月随访表1", "10个月"),
+        ("第12个月随访_CAGSFB1_627CAG随访表1", "12个月"),
+        ("personal_随访表1", "personal_随访表1"),
+    ],
+)
+def test_extract_time_point_from_sheet_name(sheet_name, expected):
+    """测试从sheet名称提取时间点（阿拉伯数字与中文数字）"""
+    assert extract_time_point_from_sheet_name(sheet_name) == expected
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_extract_followup_sheets(tmp_path, max_workers):
+    """测试只提取随访表1 sheet，按时间点重命名并去掉末尾空行"""
+    input_file = tmp_path / "raw.xlsx"
+    workbook = openpyxl.Workbook()
+    workbook.active.title = "患者基本信息"
+    first = workbook.create_sheet("第三个月随访_随访表1")
+    for row in [("subjid", "随访日期1"), ("S001", "2020-04-01"), (None, None), ("S002", None)]:
+        first.append(row)
+    # 末尾只有格式、没有值的空行
+    first.cell(row=6, column=1).number_format = "0"
+    second = workbook.create_sheet("第12个月随访_随访表1")
+    second.append(("subjid",))
+    workbook.save(input_file)
+
+    output_file = tmp_path / "extracted.xlsx"
+    extract_followup_sheets(input_file, output_file, max_workers=max_workers)
+
+    sheets = pd.read_excel(output_file, sheet_name=None)
+    assert list(sheets) == ["3个月", "12个月"]
+    df = sheets["3个月"]
+    # 中间的空行保留，末尾的空行丢弃
+    assert df.shape == (3, 2)
+    assert df["subjid"].tolist()[::2] == ["S001", "S002"]
+    assert df.iloc[1].isna().all()
+    assert sheets["12个月"].empty
@@ -0,0 +1,56 @@
+"""日志系统测试"""
+
+import logging
+import multiprocessing
+import time
+from pathlib import Path
+
+import pytest
+
+from src.logger import setup_logger
+
+
+def _read_logs(log_dir: Path, expected: str, timeout: float = 5.0) -> str:
+    """等待后台线程把日志写入文件，返回日志内容"""
+    deadline = time.monotonic() + timeout
+    while True:
+        text = "".join(f.read_text(encoding="utf-8") for f in log_dir.glob("*.log"))
+        if expected in text or time.monotonic() > deadline:
+            return text
+        time.sleep(0.05)
+
+
+def _new_logger(name: str, log_dir: Path) -> logging.Logger:
+    """创建日志记录器 (不向根记录器传播，避免pytest的日志捕获处理器使setup_logger提前返回)"""
+    logging.getLogger(name).propagate = False
+    return setup_logger(name, log_dir=str(log_dir))
+
+
+def _log_in_child(name: str) -> None:
+    setup_logger(name).info("来自工作进程的日志")
+
+
+class TestSetupLogger:
+    """setup_logger测试"""
+
+    def test_writes_log_file(self, tmp_path):
+        """测试日志写入轮转文件"""
+        logger = _new_logger("test_logger_file", tmp_path)
+        logger.info("主进程日志")
+
+        assert "主进程日志" in _read_logs(tmp_path, "主进程日志")
+
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(), reason="需要fork启动方式"
+    )
+    def test_forked_worker_logs_reach_file(self, tmp_path):
+        """测试fork出的工作进程的日志也写入主进程的日志文件"""
+        name = "test_logger_fork"
+        _new_logger(name, tmp_path)
+
+        process = multiprocessing.get_context("fork").Process(target=_log_in_child, args=(name,))
+        process.start()
+        process.join(timeout=10)
+
+        assert process.exitcode == 0
+        assert "来自工作进程的日志" in _read_logs(tmp_path, "来自工作进程的日志")
@@ -0,0 +1,109 @@
+"""纵向数据导入器测试"""
+
+import os
+from datetime import date
+
+import pandas as pd
+
+from src.longitudinal_importer import LongitudinalDataImporter, _read_workbook
+
+
+class TestSheetIndex:
+    """Sheet行索引测试"""
+
+    def test_index_by_subjid(self):
+        """测试按subjid索引首行数据，缺失的ID被跳过"""
+        importer = LongitudinalDataImporter()
+        df = pd.DataFrame(
+            {
+                "subjid": ["S001", "S002", "S001", None],
+                "随访日期1": ["2020-04-01", "2020-05-01", "2020-06-01", "2020-07-01"],
+            }
+        )
+
+        rows, fields = importer._get_sheet_index(df)
+
+        assert list(rows) == ["S001", "S002"]
+        assert rows["S001"]["随访日期1"] == "2020-04-01"
+        assert fields["visit_date"] == ("随访日期1",)
+        assert fields["death_date"] == ()
+
+    def test_index_built_once_per_sheet(self):
+        """测试同一Sheet的索引只构建一次，不同Sheet各自构建"""
+        importer = LongitudinalDataImporter()
+        df = pd.DataFrame({"subjid": ["S001"]})
+        other = pd.DataFrame({"subjid": ["S002"]})
+
+        index = importer._get_sheet_index(df)
+        assert importer._get_sheet_index(df) is index
+        assert list(importer._get_sheet_index(other)[0]) == ["S002"]
+
+    def test_sheet_without_subjid(self):
+        """测试没有subjid列的Sheet索引为空"""
+        importer = LongitudinalDataImporter()
+        rows, _ = importer._get_sheet_index(pd.DataFrame({"patient_id": ["P001"]}))
+        assert rows == {}
+
+
+class TestLoadExcelFile:
+    """Excel加载与缓存测试"""
+
+    def test_import_longitudinal_data(self, longitudinal_excel_file):
+        """测试导入并合并多个时间点的数据"""
+        importer = LongitudinalDataImporter()
+        assert importer.load_excel_file(str(longitudinal_excel_file))
+
+        records = importer.import_longitudinal_data()
+
+        assert [r.patient_id for r in records] == ["S001", "S002", "S003"]
+        assert records[0].enrollment_date == date(2020, 1, 1)
+        assert [tp.months for tp in records[0].time_points] == [3, 6]
+        # 导入完成后释放行索引
+        assert importer._sheet_index == {}
+
+    def test_workbook_cached_until_modified(self, longitudinal_excel_file):
+        """测试未修改的文件复用缓存的解析结果，文件修改后重新解析"""
+        _read_workbook.cache_clear()
+        path = str(longitudinal_excel_file)
+
+        first = LongitudinalDataImporter()
+        second = LongitudinalDataImporter()
+        assert first.load_excel_file(path) and second.load_excel_file(path)
+        assert _read_workbook.cache_info().hits == 1
+        assert first.sheet_data["患者基本信息"] is second.sheet_data["患者基本信息"]
+
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        third = LongitudinalDataImporter()
+        assert third.load_excel_file(path)
+        assert _read_workbook.cache_info().misses == 2
+        assert third.sheet_data["患者基本信息"] is not first.sheet_data["患者基本信息"]
+
+    def test_usecols(self, tmp_path):
+        """测试只读取导入所需的列"""
+        file_path = tmp_path / "extra_columns.xlsx"
+        pd.DataFrame({"subjid": ["S001"], "groupdate": ["2020-01-01"], "unused": [1]}).to_excel(
+            file_path, sheet_name="患者基本信息", index=False
+        )
+
+        importer = LongitudinalDataImporter()
+        assert importer.load_excel_file(
+            str(file_path), usecols=LongitudinalDataImporter.is_required_column
+        )
+        assert list(importer.sheet_data["患者基本信息"].columns) == ["subjid", "groupdate"]
+
+    def test_parallel_loading_matches_serial(self, longitudinal_excel_file):
+        """测试多进程加载Sheet的结果与单进程一致"""
+        _read_workbook.cache_clear()
+        serial = LongitudinalDataImporter()
+        parallel = LongitudinalDataImporter()
+        assert serial.load_excel_file(str(longitudinal_excel_file))
+        assert parallel.load_excel_file(str(longitudinal_excel_file), max_workers=2)
+
+        assert list(parallel.sheet_data) == list(serial.sheet_data)
+        for name, df in serial.sheet_data.items():
+            pd.testing.assert_frame_equal(parallel.sheet_data[name], df)
+
+    def test_missing_file(self, tmp_path):
+        """测试文件不存在时返回False"""
+        assert not LongitudinalDataImporter().load_excel_file(str(tmp_path / "missing.xlsx"))
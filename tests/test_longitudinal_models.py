@@ -0,0 +1,54 @@
+"""纵向数据模型测试"""
+
+import copy
+from datetime import date
+from src.longitudinal_models import LongitudinalFollowupRecord
+
+
+class TestLongitudinalFollowupRecord:
+    """LongitudinalFollowupRecord测试"""
+
+    def _make_record(self):
+        return LongitudinalFollowupRecord(
+            patient_id="P001",
+            enrollment_date=date(2020, 1, 1),
+            first_event_type="death",
+            first_event_date=date(2021, 6, 15),
+        )
+
+    def test_flattened_dict_is_cached(self):
+        """测试未修改的记录重复展平时复用缓存"""
+        record = self._make_record()
+        flat = record.to_flattened_dict()
+        assert flat["patient_id"] == "P001"
+        assert flat["first_event_date"] == "2021-06-15"
+        assert record._get_flattened() is record._get_flattened()
+
+        # 返回的是副本，修改它不影响缓存
+        flat["patient_id"] = "changed"
+        assert record.to_flattened_dict()["patient_id"] == "P001"
+
+    def test_flattened_cache_invalidated_on_assignment(self):
+        """测试修改字段后展平缓存失效"""
+        record = self._make_record()
+        record.to_flattened_dict()
+        record.first_event_type = "mi"
+        assert record.to_flattened_dict()["first_event_type"] == "mi"
+        assert LongitudinalFollowupRecord.to_columnar([record])["first_event_type"] == ["mi"]
+
+    def test_flattened_cache_not_shared_with_copies(self):
+        """测试复制记录后不会沿用原记录的展平缓存"""
+        record = self._make_record()
+        record.to_flattened_dict()
+
+        updated = record.model_copy(update={"patient_id": "P002"})
+        assert updated.to_flattened_dict()["patient_id"] == "P002"
+
+        deep = record.model_copy(update={"patient_id": "P003"}, deep=True)
+        assert deep.to_flattened_dict()["patient_id"] == "P003"
+
+        shallow = copy.copy(record)
+        shallow.patient_id = "P004"
+        assert shallow.to_flattened_dict()["patient_id"] == "P004"
+
+        assert record.to_flattened_dict()["patient_id"] == "P001"
@@ -0,0 +1,55 @@
+"""处理流程测试"""
+
+import pandas as pd
+from src.pipeline import DEFAULT_EMIT, EMIT_FORMATS, parse_emit, run_pipeline
+
+
+class TestParseEmit:
+    """parse_emit测试"""
+
+    def test_default_formats(self):
+        """测试未指定时使用默认格式"""
+        assert parse_emit(None) == list(DEFAULT_EMIT)
+
+    def test_survival_only(self):
+        """测试只导出生存分析CSV"""
+        assert parse_emit(None, survival_only=True) == ["csv"]
+
+    def test_all_and_duplicates(self):
+        """测试all展开为全部格式，重复的格式只保留一次"""
+        assert parse_emit(["csv", "all"]) == list(EMIT_FORMATS)
+        assert parse_emit(["parquet", "csv", "parquet"]) == ["parquet", "csv"]
+
+
+class TestRunPipeline:
+    """run_pipeline测试"""
+
+    def test_csv_only(self, longitudinal_excel_file, tmp_path):
+        """测试只导出生存分析CSV"""
+        result = run_pipeline(str(longitudinal_excel_file), tmp_path / "out", emit=["csv"])
+
+        assert list(result.output_files) == ["csv"]
+        survival = pd.read_csv(result.output_files["csv"])
+        assert survival["patient_id"].tolist() == ["S001", "S002", "S003"]
+        assert survival["event_occurred"].tolist() == [0, 0, 1]
+        # 与DataFrame.to_csv一致: 含缺失值的整数列按float格式写出
+        lines = result.output_files["csv"].read_text(encoding="utf-8").splitlines()
+        assert [line.split(",")[3] for line in lines] == ["age", "60.0", "", "70.0"]
+
+    def test_parquet_failure_still_writes_csv(self, longitudinal_excel_file, tmp_path, monkeypatch):
+        """测试Parquet导出失败（如未安装pyarrow）时仍导出生存分析CSV"""
+
+        def to_parquet(*args, **kwargs):
+            raise ImportError("Unable to find a usable engine")
+
+        monkeypatch.setattr(pd.DataFrame, "to_parquet", to_parquet)
+        result = run_pipeline(
+            str(longitudinal_excel_file), tmp_path / "out", emit=["parquet", "csv"]
+        )
+
+        assert list(result.output_files) == ["csv"]
+        assert result.output_files["csv"].exists()
+
+    def test_missing_file(self, tmp_path):
+        """测试输入文件不存在时返回None"""
+        assert run_pipeline(str(tmp_path / "missing.xlsx"), tmp_path / "out") is None